@@ -0,0 +1,48 @@
+import os
+import streamlit as st
+from datetime import datetime
+from xcel.batch import TEMPLATES, render_batch, pi_sequence, status_report, zip_results
+
+st.set_page_config(page_title="Batch Proforma Invoices", layout="centered")
+st.title("🗂️ Batch Proforma Invoice Generator")
+
+uploaded_files = st.file_uploader("Upload order workbooks", type=["xlsx"], accept_multiple_files=True)
+
+if uploaded_files:
+    st.write(f"### {len(uploaded_files)} workbook(s)")
+
+    # PI numbers run sequentially over the uploads, in upload order
+    today_str = datetime.today().strftime("%d/%m/%Y")
+    pi_prefix = st.text_input("PI No. prefix", "SAR/LG/")
+    pi_start = st.number_input("First PI No.", min_value=1, value=1, step=1)
+    pi_date = st.text_input("PI Date", today_str)
+
+    template = st.selectbox("Template", list(TEMPLATES))
+    jobs = st.slider("Parallel workers", 1, os.cpu_count() or 1, os.cpu_count() or 1)
+
+    st.write("### ✍️ Invoice Details (shared by every PI)")
+    consignee_name = st.text_input("Consignee Name", "RNA Resource Group Ltd - Landmark (Babyshop)")
+    consignee_addr = st.text_area("Consignee Address", "P.O Box 25030, Dubai, UAE")
+    consignee_tel = st.text_input("Consignee Tel/Fax", "Tel: 00971 4 8095500, Fax: 00971 4 8095555/66")
+    buyer_name = st.text_input("Buyer Name", "LANDMARK GROUP")
+    brand_name = st.text_input("Brand Name", "Juniors")
+    payment_term = st.text_input("Payment Term", "T/T")
+
+    if st.button("Generate Proforma Invoices"):
+        fields = dict(consignee_name=consignee_name, consignee_addr=consignee_addr,
+                      consignee_tel=consignee_tel, buyer_name=buyer_name, brand_name=brand_name,
+                      payment_term=payment_term)
+        files = [(f.name, f.getvalue()) for f in uploaded_files]
+        with st.spinner("Rendering..."):
+            results = render_batch(files, fields, pi_sequence(pi_prefix, int(pi_start), date=pi_date),
+                                   theme=TEMPLATES[template], jobs=jobs)
+
+        report = status_report(results)
+        failed = int((report["status"] != "ok").sum())
+        if failed:
+            st.error(f"❌ {failed} of {len(results)} workbook(s) failed.")
+        else:
+            st.success(f"✅ {len(results)} proforma invoice(s) generated.")
+        st.dataframe(report)
+
+        st.download_button("⬇️ Download PDFs (zip)", zip_results(results), file_name="Proforma_Invoices.zip", mime="application/zip")
@@ -0,0 +1 @@
+# Benchmarks for the parsing / rendering pipeline (run from the repo root).
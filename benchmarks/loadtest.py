@@ -0,0 +1,264 @@
+# --- Load test: N merchandiser sessions against one in-process Streamlit "server" ---
+# Each session is a headless AppTest of one app, driven from its own thread
+# the way a browser tab drives a Streamlit session: open the page, upload an
+# order workbook, fill in the invoice form (or pick the group-by column), press
+# Generate and wait for the download button. Every interaction is timed;
+# sessions share the process, its GIL, the parse / render caches and the
+# render worker pool, just like the sessions of one real server process.
+#
+# Background renders are awaited by rerunning the whole script every --poll
+# seconds (AppTest cannot rerun the status fragment on its own), which is a
+# little more work than a browser's fragment polling.
+#
+#   python -m benchmarks.loadtest --sessions 12 --apps saram neo xcelapp --rounds 3 --out load.json
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+APPS = ["saram", "neo", "xcelapp"]
+
+
+def _proforma(at, workbook, i, args):
+    yield "upload", lambda: at.file_uploader[0].set_value((f"order_{i}.xlsx", workbook, XLSX)).run()
+    # typing inside the invoice form does not rerun the script; the values go up with the submit
+    inputs = at.text_input
+    inputs[0].set_value(f"SAR/LG/{i:04d} Dt. 01/01/2025")
+    inputs[1].set_value(f"Consignee {i}")
+    yield "generate", lambda: _until_download(at.button[0].click().run(), args)
+
+
+def _table(at, workbook, i, args):
+    yield "upload", lambda: at.file_uploader[0].set_value((f"table_{i}.xlsx", workbook, XLSX)).run()
+    select = at.selectbox[0]
+    yield "group_by", lambda: select.set_value(select.options[1]).run()
+    yield "generate", lambda: at.button[0].click().run()
+
+
+SCENARIOS = {"saram": _proforma, "neo": _proforma, "xcelapp": _table}
+
+
+def _until_download(at, args):
+    deadline = time.perf_counter() + args.timeout
+    while not at.download_button and not at.exception and not at.error:
+        if time.perf_counter() > deadline:
+            raise TimeoutError("no download button")
+        time.sleep(args.poll)
+        at.run()
+    return at
+
+
+def _failure(at):
+    if at.exception:
+        return at.exception[0].value
+    if at.error:
+        return at.error[0].value
+    return None
+
+
+def session(n, app, workbooks, args, samples, errors, start_at):
+    from streamlit.testing.v1 import AppTest
+
+    time.sleep(max(0.0, start_at - time.perf_counter()))
+    at = AppTest.from_file(os.path.join(ROOT, app + ".py"), default_timeout=args.timeout)
+    steps = [("open", at.run)]
+    for r, workbook in enumerate(workbooks):
+        steps.append(SCENARIOS[app](at, workbook, n * args.rounds + r, args))
+    for step in steps:
+        for name, action in ([step] if isinstance(step, tuple) else step):
+            started = time.perf_counter()
+            try:
+                action()
+                failure = _failure(at)
+            except Exception as e:
+                failure = f"{type(e).__name__}: {e}"
+            elapsed = time.perf_counter() - started
+            with _lock:
+                if failure:
+                    errors.append({"app": app, "session": n, "interaction": name, "error": str(failure)[:200]})
+                else:
+                    samples.setdefault((app, name), []).append(elapsed)
+            time.sleep(args.think)
+
+
+_lock = threading.Lock()
+
+
+# AppTest assumes one test runs at a time: each run installs its own mock
+# Runtime, clears it when it finishes, and turns the "global.appTest" option on
+# for its duration only. With runs overlapping, a session whose script is still
+# running would lose both. Keep the option on for the whole load test and let
+# Runtime.instance() fall back to the latest mock a run installed.
+@contextlib.contextmanager
+def concurrent_apptest():
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.testing.v1 import app_test
+    from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+    latest = {}
+    script_run = LocalScriptRunner.run
+
+    def run(self, *args, **kwargs):
+        latest["runtime"] = Runtime._instance or latest.get("runtime")
+        return script_run(self, *args, **kwargs)
+
+    def instance(cls):
+        runtime = cls._instance or latest.get("runtime")
+        if runtime is None:
+            raise RuntimeError("Runtime hasn't been created!")
+        return runtime
+
+    saved = config.get_option("global.appTest")
+    config.set_option("global.appTest", True)
+    try:
+        with mock.patch.object(LocalScriptRunner, "run", run), \
+             mock.patch.object(Runtime, "instance", classmethod(instance)), \
+             mock.patch.object(Runtime, "exists", classmethod(lambda cls: (cls._instance or latest.get("runtime")) is not None)), \
+             mock.patch.object(app_test, "patch_config_options", lambda options: contextlib.nullcontext()):
+            yield
+    finally:
+        config.set_option("global.appTest", saved)
+
+
+# --- Server side: CPU and RSS of this process, sampled while the sessions run ---
+def _rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # peak, not current, off Linux
+
+
+class Sampler(threading.Thread):
+    def __init__(self, interval=0.25):
+        super().__init__(daemon=True)
+        self.interval, self.points = interval, []
+        self._done = threading.Event()
+
+    def run(self):
+        last_wall, last_cpu = time.perf_counter(), sum(os.times()[:2])
+        while not self._done.wait(self.interval):
+            wall, cpu = time.perf_counter(), sum(os.times()[:2])
+            self.points.append((100 * (cpu - last_cpu) / (wall - last_wall), _rss_mb()))
+            last_wall, last_cpu = wall, cpu
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        cpu = [p[0] for p in self.points] or [0.0]
+        rss = [p[1] for p in self.points] or [_rss_mb()]
+        return {"cpu_avg_pct": round(sum(cpu) / len(cpu), 1), "cpu_max_pct": round(max(cpu), 1),
+                "rss_peak_mb": round(max(rss), 1), "rss_end_mb": round(rss[-1], 1), "cpus": os.cpu_count()}
+
+
+# nearest-rank percentile
+def percentile(values, q):
+    values = sorted(values)
+    return values[max(0, min(len(values) - 1, -(-len(values) * q // 100) - 1))]
+
+
+def run(args):
+    sys.path.insert(0, ROOT)
+    from benchmarks.workbook import make_order_workbook
+
+    apps = [args.apps[n % len(args.apps)] for n in range(args.sessions)]
+    # a workbook per session and round (distinct bytes, so parse and render caches miss like real orders)
+    workbooks = []
+    for n, app in enumerate(apps):
+        plain = app == "xcelapp"
+        workbooks.append([make_order_workbook(rows=args.rows, styles=args.styles, columns=args.columns,
+                                              seed=1 if args.same_workbook else n * args.rounds + r + 1,
+                                              two_row_header=not plain, label_block=not plain)
+                          for r in range(args.rounds)])
+
+    samples, errors = {}, []
+    sampler = Sampler()
+    rss_start = _rss_mb()
+    sampler.start()
+    started = time.perf_counter()
+    threads = [threading.Thread(target=session, args=(n, app, workbooks[n], args, samples, errors,
+                                                      started + args.ramp * n / max(1, args.sessions - 1)))
+               for n, app in enumerate(apps)]
+    with concurrent_apptest():
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    wall = time.perf_counter() - started
+    server = sampler.stop()
+
+    results = []
+    for (app, name), values in sorted(samples.items()):
+        results.append({"app": app, "interaction": name, "n": len(values),
+                        "p50_ms": round(percentile(values, 50) * 1000, 1),
+                        "p95_ms": round(percentile(values, 95) * 1000, 1),
+                        "p99_ms": round(percentile(values, 99) * 1000, 1),
+                        "max_ms": round(max(values) * 1000, 1)})
+    return {
+        "meta": {"sessions": args.sessions, "apps": args.apps, "rounds": args.rounds, "rows": args.rows,
+                 "styles": args.styles, "columns": args.columns, "ramp_s": args.ramp, "think_s": args.think,
+                 "render_workers": os.environ.get("XCEL_RENDER_WORKERS", "2"),
+                 "python": platform.python_version(), "platform": platform.platform(),
+                 "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "wall_s": round(wall, 2)},
+        "server": {**server, "rss_start_mb": round(rss_start, 1)},
+        "results": results,
+        "errors": errors,
+    }
+
+
+def summary(report):
+    out = sys.stderr
+    print(f"  {'app':<9} {'interaction':<10} {'n':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}", file=out)
+    for r in report["results"]:
+        print(f"  {r['app']:<9} {r['interaction']:<10} {r['n']:>4} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} "
+              f"{r['p99_ms']:>9.1f} {r['max_ms']:>9.1f}", file=out)
+    s = report["server"]
+    print(f"  server: CPU avg {s['cpu_avg_pct']}% / max {s['cpu_max_pct']}% ({s['cpus']} CPUs), "
+          f"RSS {s['rss_start_mb']} -> peak {s['rss_peak_mb']} MB, {report['meta']['wall_s']} s wall", file=out)
+    if report["errors"]:
+        print(f"  {len(report['errors'])} failed interactions, first: {report['errors'][0]}", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="concurrent headless sessions against the Streamlit apps; JSON to stdout or --out")
+    parser.add_argument("--sessions", type=int, default=6)
+    parser.add_argument("--apps", nargs="+", choices=APPS, default=APPS, help="sessions are spread over these round-robin")
+    parser.add_argument("--rounds", type=int, default=2, help="upload / fill in / generate cycles per session")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--styles", type=int, default=50)
+    parser.add_argument("--columns", type=int, default=6)
+    parser.add_argument("--same-workbook", action="store_true", help="every session uploads the same workbook (cache hits)")
+    parser.add_argument("--ramp", type=float, default=0.0, help="seconds over which sessions start (0: all at once)")
+    parser.add_argument("--think", type=float, default=0.0, help="pause after each interaction, seconds")
+    parser.add_argument("--poll", type=float, default=0.25, help="rerun interval while a PDF renders, seconds")
+    parser.add_argument("--timeout", type=float, default=300.0, help="per interaction, seconds")
+    parser.add_argument("--out", help="write the JSON report here")
+    args = parser.parse_args()
+
+    # one JSON timing line per script run would drown the report
+    os.environ.setdefault("XCEL_TIMING_LOG", "off")
+    report = run(args)
+    text = json.dumps(report, indent=1)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    summary(report)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+import argparse
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.workbook import make_order_workbook
+
+STAGES = ["load", "label_scan", "header", "aggregate", "render"]
+
+
+# --- One app's pipeline, stage by stage, as the app runs it (no caches) ---
+# Each path is a list of (stage, fn); fn takes and returns the state dict.
+def _load(state):
+    from xcel.loader import read_grid
+    state["raw"] = read_grid(io.BytesIO(state["data"]))
+    return state
+
+
+def _labels(state):
+    from xcel.labels import LabelIndex, ORDER_LABELS
+    state["labels"] = LabelIndex(state["raw"])
+    state["meta"] = state["labels"].extract(ORDER_LABELS)
+    return state
+
+
+def _proforma_header(state):
+    from xcel.pipeline import proforma_items
+    state["df"], _, state["columns"] = proforma_items(state["raw"], state["labels"])
+    return state
+
+
+def _proforma_aggregate(state):
+    from xcel.aggregate import aggregate_styles
+    from xcel.pipeline import _finish
+    agg = aggregate_styles(state["df"], *state["columns"])
+    state["order"] = _finish(dict(state["meta"]), agg)
+    return state
+
+
+def _proforma_render(theme):
+    def render(state):
+        from xcel.proforma import render_proforma
+        state["pdf"] = render_proforma(state["order"], {}, theme=theme)
+        return state
+    return render
+
+
+def _style_header(state):
+    from xcel.loader import frame_from_grid
+    row = state["labels"].row_of("style")
+    state["df"] = frame_from_grid(state["raw"], header=row).dropna(how="all")
+    return state
+
+
+def _style_aggregate(state):
+    state["agg"] = state["df"].groupby("Style").sum(numeric_only=True).reset_index()
+    return state
+
+
+def _extraction_render(state):
+    from reportlab.lib.pagesizes import A4
+    from xcel.fastgrid import render_grid
+    meta = state["meta"]
+    head = [(label, str(meta[key])) for label, key in
+            [("Order No:", "order_no"), ("Brand:", "brand"), ("Made in Country:", "made_in")] if meta[key]]
+    state["pdf"] = render_grid(state["agg"], pagesize=A4, head=head, stream=True)
+    return state
+
+
+def _plain_load(state):
+    import pandas as pd
+    state["df"] = pd.read_excel(io.BytesIO(state["data"]))
+    return state
+
+
+def _plain_aggregate(state):
+    df = state["df"]
+    state["agg"] = df.groupby(df.columns[0]).sum(numeric_only=True).reset_index()
+    return state
+
+
+def _grid_render(state):
+    from reportlab.lib.pagesizes import A4
+    from xcel.fastgrid import render_grid
+    state["pdf"] = render_grid(state["agg"], pagesize=A4, stream=True)
+    return state
+
+
+PATHS = {
+    "saram": [("load", _load), ("label_scan", _labels), ("header", _proforma_header),
+              ("aggregate", _proforma_aggregate), ("render", _proforma_render("master"))],
+    "neo": [("load", _load), ("label_scan", _labels), ("header", _proforma_header),
+            ("aggregate", _proforma_aggregate), ("render", _proforma_render("dark"))],
+    "extraction": [("load", _load), ("label_scan", _labels), ("header", _style_header),
+                   ("aggregate", _style_aggregate), ("render", _extraction_render)],
+    # xcelapp.py reads a plain table: header on row 1, no label block
+    "xcelapp": [("load", _plain_load), ("aggregate", _plain_aggregate), ("render", _grid_render)],
+}
+
+
+def run_path(name, data, plain):
+    state = {"data": plain if name == "xcelapp" else data}
+    times = {}
+    for stage, fn in PATHS[name]:
+        started = time.perf_counter()
+        state = fn(state)
+        times[stage] = time.perf_counter() - started
+    return times, len(state["pdf"])
+
+
+# one extra run with tracemalloc on: peak / net memory and top allocation sites
+# per benchmark stage (a private request, so the library's own stages stay quiet)
+def memory_path(name, data, plain):
+    from xcel.timing import Request
+    state = {"data": plain if name == "xcelapp" else data}
+    request = Request(name, memory=True)
+    for stage, fn in PATHS[name]:
+        with request.stage(stage):
+            state = fn(state)
+    return {s["stage"]: s for s in request.finish().as_dict()["stages"]}
+
+
+def _git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(paths, rows, styles, columns, repeat, seed=1, memory=False):
+    data = make_order_workbook(rows=rows, styles=styles, columns=columns, seed=seed)
+    plain = make_order_workbook(rows=rows, styles=styles, columns=columns, seed=seed,
+                                two_row_header=False, label_block=False)
+    # first run imports pandas / ReportLab and warms font and image caches
+    for name in paths:
+        run_path(name, data, plain)
+
+    results = []
+    for name in paths:
+        samples = [run_path(name, data, plain) for _ in range(repeat)]
+        for stage, _ in PATHS[name]:
+            runs = [s[0][stage] for s in samples]
+            results.append({"path": name, "stage": stage, "median_s": statistics.median(runs),
+                            "min_s": min(runs), "runs_s": runs})
+        results.append({"path": name, "stage": "total", "median_s": statistics.median(sum(s[0].values()) for s in samples),
+                        "min_s": min(sum(s[0].values()) for s in samples), "pdf_bytes": samples[-1][1]})
+    if memory:  # after the timed runs: tracing slows everything down
+        for name in paths:
+            stages = memory_path(name, data, plain)
+            for r in results:
+                if r["path"] == name and r["stage"] in stages:
+                    r.update({k: stages[r["stage"]][k] for k in ("peak_kb", "net_kb", "top")})
+                elif r["path"] == name and r["stage"] == "total":
+                    r["peak_kb"] = max(s["peak_kb"] for s in stages.values())
+    return {
+        "meta": {"git": _git_rev(), "python": platform.python_version(), "platform": platform.platform(),
+                 "rows": rows, "styles": styles, "columns": columns, "repeat": repeat, "seed": seed,
+                 "memory": memory,
+                 "workbook_bytes": len(data), "created": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+
+
+def compare(report, baseline):
+    params = ("rows", "styles", "columns")
+    if any(report["meta"][k] != baseline["meta"].get(k) for k in params):
+        print("note: baseline was run with a different workbook size", file=sys.stderr)
+    before = {(r["path"], r["stage"]): r for r in baseline["results"]}
+    for r in report["results"]:
+        old = before.get((r["path"], r["stage"]), {})
+        line = f"  {r['path']:<11} {r['stage']:<11} {r['median_s'] * 1000:9.1f} ms  {_ratio(r, old, 'median_s')}"
+        if "peak_kb" in r:
+            line += f"  {r['peak_kb'] / 1024:8.1f} MB peak  {_ratio(r, old, 'peak_kb')}"
+        print(line, file=sys.stderr)
+
+
+def _ratio(new, old, key):
+    return f"{new[key] / old[key]:6.2f}x" if old.get(key) else "     -"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="time each pipeline stage per app path; JSON to stdout or --out")
+    parser.add_argument("--paths", nargs="+", choices=list(PATHS), default=list(PATHS))
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--styles", type=int, default=200)
+    parser.add_argument("--columns", type=int, default=6, help="size (Qty) columns per row")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="write the JSON report here")
+    parser.add_argument("--baseline", help="earlier JSON report to compare medians (and peaks) against")
+    parser.add_argument("--memory", action="store_true",
+                        help="one more run per path under tracemalloc: peak / net memory and top allocation sites")
+    args = parser.parse_args()
+
+    report = run(args.paths, args.rows, args.styles, args.columns, args.repeat, args.seed, args.memory)
+    text = json.dumps(report, indent=1)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
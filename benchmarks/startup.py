@@ -0,0 +1,94 @@
+# --- Cold-start benchmark for the Streamlit apps ---
+# Each sample is a fresh Python process (what a new Streamlit worker pays)
+# that runs the app script three times, the way Streamlit reruns it:
+#   first paint  - import streamlit + run the script with nothing uploaded
+#   parsed       - rerun with the workbook uploaded (preview tables drawn)
+#   first render - rerun with the Generate button pressed, wait for the
+#                  background render, rerun until the download button has the PDF
+# Times are cumulative from process start. Widgets are stubbed so no server
+# is needed; st.* output calls still run.
+#
+#   python benchmarks/startup.py --app saram.py --xlsx order.xlsx [--root other/checkout]
+import argparse
+import io
+import json
+import os
+import runpy
+import statistics
+import subprocess
+import sys
+import time
+
+STAGES = ["first_paint", "parsed", "first_render"]
+
+
+def child(app, xlsx):
+    started = time.perf_counter()
+    import logging
+    import warnings
+    logging.disable(logging.CRITICAL)
+    warnings.filterwarnings("ignore")
+    import streamlit as st
+
+    class Upload(io.BytesIO):
+        name = os.path.basename(xlsx)
+        file_id = "startup-bench"  # the apps parse once per file_id
+
+    with open(xlsx, "rb") as f:
+        data = f.read()
+    state = {"upload": None, "click": False, "pdf": None}
+    st.file_uploader = lambda *a, **k: state["upload"]
+    st.button = lambda label, *a, **k: state["click"] and label != "Cancel"  # not render_status's
+    st.form_submit_button = lambda *a, **k: state["click"]
+    st.fragment = lambda fn=None, **k: fn  # bare mode skips fragment bodies; run them inline
+    st.rerun = lambda *a, **k: None  # render_status reruns the page when its job finishes
+    st.download_button = lambda label, d, *a, **k: state.update(pdf=d)
+
+    marks = {}
+    runpy.run_path(app, run_name="__main__")
+    marks["first_paint"] = time.perf_counter() - started
+    state["upload"] = Upload(data)
+    runpy.run_path(app, run_name="__main__")
+    marks["parsed"] = time.perf_counter() - started
+    state["upload"], state["click"] = Upload(data), True
+    runpy.run_path(app, run_name="__main__")
+    job = st.session_state.get("render_job")  # saram / neo render on a worker thread
+    if job is not None:
+        job.result()
+        state["upload"], state["click"] = Upload(data), False
+        runpy.run_path(app, run_name="__main__")
+    marks["first_render"] = time.perf_counter() - started
+    if not state["pdf"]:
+        raise SystemExit(f"{app} produced no PDF")
+    print(json.dumps(marks))
+
+
+def sample(root, app, xlsx):
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", "--app", app, "--xlsx", xlsx],
+                         cwd=root, env={**os.environ, "PYTHONPATH": root}, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--app", default="saram.py")
+    parser.add_argument("--xlsx", required=True, help="order workbook to upload")
+    parser.add_argument("--root", default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        help="checkout to run the app from (default: this one)")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    xlsx = os.path.abspath(args.xlsx)
+    if args.child:
+        return child(args.app, xlsx)
+
+    root = os.path.abspath(args.root)
+    samples = [sample(root, args.app, xlsx) for _ in range(args.repeat)]
+    print(f"{args.app} in {root} ({args.repeat} fresh processes, median / min ms)")
+    for stage in STAGES:
+        ms = [s[stage] * 1000 for s in samples]
+        print(f"  {stage:<13} {statistics.median(ms):8.0f} {min(ms):8.0f}")
+
+
+if __name__ == "__main__":
+    main()
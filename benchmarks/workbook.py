@@ -0,0 +1,69 @@
+import argparse
+import datetime
+import io
+import random
+
+from openpyxl import Workbook
+
+DESCRIPTIONS = ["S/L Bodysuit 7pk", "L/S Romper 3pk", "Sleepsuit 2pk", "Jogger Set", "Printed Tee 5pk"]
+COMPOSITIONS = ["100% COTTON", "95% COTTON 5% ELASTANE", "60% COTTON 40% POLYESTER"]
+
+
+# --- Synthetic buyer order sheet, laid out like the real uploads ---
+# Buyer name in A1, the label block ("Order No :", "Made in Country :",
+# "Texture :", ... with values 1-2 cells to the right), a blank row, then the
+# item table: Style / Description / Composition, one Qty column per size,
+# Total, Value, Fob$. With two_row_header the header spans two rows (units on
+# the second row), as saram.py / neo.py expect; label_block=False gives a
+# plain table with the header on row 1 (xcelapp.py's input).
+# `rows` item rows cycle over `styles` style numbers; `columns` is the
+# number of size columns.
+def make_order_workbook(target=None, rows=500, styles=50, columns=6, two_row_header=True, label_block=True, seed=1):
+    rng = random.Random(seed)
+    wb = Workbook()
+    ws = wb.active
+    if label_block:
+        ws.append(["LANDMARK GROUP"])
+        ws.append(["Order No :", None, f"CPO/{rng.randint(10000, 99999)}/25", None, "Brand :", "Juniors"])
+        ws.append(["Made in Country :", "India", None, "Loading Port :", "Mumbai"])
+        ws.append(["Agreed Ship Date :", None, datetime.datetime(2025, 2, 7), None, "Order of", "Value Packs"])
+        ws.append(["Texture :", "Knitted"])
+        ws.append([])
+
+    sizes = [f"{m}-{m + 3}M" for m in range(0, 3 * columns, 3)]
+    if two_row_header:
+        ws.append(["Style", "Description", "Composition"] + sizes + ["Total", "Value", "Fob$"])
+        ws.append([None, None, None] + ["Qty"] * columns + ["Qty", "USD", None])
+    else:
+        ws.append(["Style", "Description", "Composition"] + [f"{s} Qty" for s in sizes] + ["Total Qty", "Value", "Fob$"])
+
+    names = [f"SAV{i:05d}S25" for i in range(styles)]
+    for k in range(rows):
+        i = k % styles if k % 17 else rng.randrange(styles)
+        qty = [rng.randint(0, 60) for _ in range(columns)]
+        total = sum(qty)
+        fob = round(rng.uniform(3, 12), 2) if k % 5 else 0
+        ws.append([names[i], DESCRIPTIONS[i % len(DESCRIPTIONS)], rng.choice(COMPOSITIONS)]
+                  + qty + [total, round(total * fob, 2), fob])
+
+    out = io.BytesIO() if target is None else target
+    wb.save(out)
+    return out.getvalue() if target is None else target
+
+
+def main():
+    parser = argparse.ArgumentParser(description="write a synthetic order workbook")
+    parser.add_argument("out")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--styles", type=int, default=50)
+    parser.add_argument("--columns", type=int, default=6)
+    parser.add_argument("--one-row-header", action="store_true")
+    parser.add_argument("--plain", action="store_true", help="no label block, header on the first row")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    make_order_workbook(args.out, args.rows, args.styles, args.columns,
+                        two_row_header=not args.one_row_header, label_block=not args.plain, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,6 @@
 import streamlit as st
-import pandas as pd
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet
-import tempfile
-import os
 from datetime import datetime
+from xcel.ui import stage_timings
 
 st.set_page_config(page_title="Excel Style Aggregator", layout="centered")
 
@@ -15,104 +9,105 @@ st.title("👕 Excel → PDF (Style Aggregator)")
 uploaded_file = st.file_uploader("Upload your Excel file", type=["xlsx"])
 
 if uploaded_file:
-    # Load raw Excel (no header)
-    raw_df = pd.read_excel(uploaded_file, header=None)
-
-    # --- Extract key info ---
-    buyer_name = str(raw_df.iloc[0, 0]) if not pd.isna(raw_df.iloc[0, 0]) else None
-    order_no, brand, made_in, loading_port, ship_date, order_of = [None]*6
-
-    for i, row in raw_df.iterrows():
-        for j, cell in enumerate(row):
-            cell_val = str(cell).strip().lower()
-            if cell_val == "order no :":
-                try: order_no = row[j+2]
-                except: pass
-            elif cell_val == "brand :":
-                try: brand = row[j+1]
-                except: pass
-            elif cell_val == "made in country :":
-                try: made_in = row[j+1]
-                except: pass
-            elif cell_val == "loading port :":
-                try: loading_port = row[j+1]
-                except: pass
-            elif cell_val == "agreed ship date :":
-                try: ship_date = row[j+2]
-                except: pass
-            elif cell_val == "order of":
-                try: order_of = row[j+1]
-                except: pass
-
-    # --- Find the row index where "Style" appears ---
-    header_row_idx = None
-    for i, row in raw_df.iterrows():
-        if row.astype(str).str.strip().str.lower().eq("style").any():
-            header_row_idx = i
-            break
-
-    if header_row_idx is None:
-        st.error("❌ Could not find a 'Style' header in the file.")
-    else:
-        # Use that row as header
-        df = pd.read_excel(uploaded_file, header=header_row_idx)
-        df = df.dropna(how="all")  # drop completely empty rows
-
-        st.write("### Preview of extracted data")
-        st.dataframe(df.head())
-
-        if "Style" not in df.columns:
-            st.error("❌ No 'Style' column found after parsing the file.")
+    # pandas and the parsers load once a workbook is uploaded
+    import pandas as pd
+    from xcel.loader import read_grid, frame_from_grid
+    from xcel.labels import LabelIndex, ORDER_LABELS
+    from xcel import timing
+
+    # one timing request per script run: stages below (read, label index, ...) report into it;
+    # the with block finishes it (and logs one JSON line) even if the run raises or st.stop()s
+    with timing.request("extraction", file=uploaded_file.name) as run:
+        # Load raw Excel (no header)
+        raw_df = read_grid(uploaded_file)
+
+        # --- Extract key info ---
+        buyer_name = str(raw_df.iloc[0, 0]) if not pd.isna(raw_df.iloc[0, 0]) else None
+
+        labels = LabelIndex(raw_df)
+        meta = labels.extract(ORDER_LABELS)
+        order_no, brand, made_in = meta["order_no"], meta["brand"], meta["made_in"]
+        loading_port, ship_date, order_of = meta["loading_port"], meta["ship_date"], meta["order_of"]
+
+        # --- Find the row index where "Style" appears ---
+        header_row_idx = labels.row_of("style")
+
+        if header_row_idx is None:
+            st.error("❌ Could not find a 'Style' header in the file.")
         else:
-            # Aggregate by Style (sum numeric columns)
-            agg = df.groupby("Style").sum(numeric_only=True).reset_index()
-
-            st.write("### Aggregated Data (by Style)")
-            st.dataframe(agg)
-
-            # Generate PDF
-            if st.button("Generate PDF"):
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmpfile:
-                    pdf_file = tmpfile.name
-
-                doc = SimpleDocTemplate(pdf_file, pagesize=A4)
-                styles = getSampleStyleSheet()
-                elements = []
-
-                # --- Header Info ---
-                today = datetime.today().strftime("%d-%m-%Y")
-                header_info = [
-                    f"<b>Buyer:</b> {buyer_name}" if buyer_name else None,
-                    f"<b>Order No:</b> {order_no}" if order_no else None,
-                    f"<b>Brand:</b> {brand}" if brand else None,
-                    f"<b>Made in Country:</b> {made_in}" if made_in else None,
-                    f"<b>Loading Port:</b> {loading_port}" if loading_port else None,
-                    f"<b>Agreed Ship Date:</b> {ship_date}" if ship_date else None,
-                    f"<b>Order Of:</b> {order_of}" if order_of else None,
-                    f"<b>Report Date:</b> {today}"
-                ]
-
-                for line in header_info:
-                    if line:
-                        elements.append(Paragraph(line, styles["Normal"]))
-                elements.append(Spacer(1, 12))
-
-                # --- Table Data ---
-                data = [agg.columns.tolist()] + agg.values.tolist()
-
-                table = Table(data)
-                table.setStyle(TableStyle([
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ]))
-
-                elements.append(table)
-                doc.build(elements)
-
-                with open(pdf_file, "rb") as f:
-                    st.download_button("⬇️ Download PDF", f, file_name="style_report.pdf")
-
-                os.remove(pdf_file)
+            # Use that row as header
+            df = frame_from_grid(raw_df, header=header_row_idx)
+            df = df.dropna(how="all")  # drop completely empty rows
+
+            st.write("### Preview of extracted data")
+            st.dataframe(df.head())
+
+            if "Style" not in df.columns:
+                st.error("❌ No 'Style' column found after parsing the file.")
+            else:
+                # Aggregate by Style (sum numeric columns)
+                with timing.stage("aggregate") as s:
+                    agg = df.groupby("Style").sum(numeric_only=True).reset_index()
+                    s["rows"] = len(df)
+
+                st.write("### Aggregated Data (by Style)")
+                st.dataframe(agg)
+
+                # Streaming lays out and writes one page at a time (flat memory for big reports)
+                streaming = st.checkbox("Stream PDF page by page", value=True)
+                st.checkbox("Show stage timings", key="show_timings")
+
+                # Generate PDF
+                if st.button("Generate PDF"):
+                    # ReportLab loads only when a PDF is requested
+                    from reportlab.platypus import Table, TableStyle, Paragraph, Spacer
+                    from reportlab.lib import colors
+                    from reportlab.lib.pagesizes import A4
+                    from reportlab.lib.styles import getSampleStyleSheet
+                    from xcel.render import render_pdf
+                    from xcel.fastgrid import render_grid
+
+                    # --- Header Info ---
+                    today = datetime.today().strftime("%d-%m-%Y")
+                    header_info = [
+                        ("Buyer:", buyer_name),
+                        ("Order No:", order_no),
+                        ("Brand:", brand),
+                        ("Made in Country:", made_in),
+                        ("Loading Port:", loading_port),
+                        ("Agreed Ship Date:", ship_date),
+                        ("Order Of:", order_of),
+                        ("Report Date:", today),
+                    ]
+                    header_info = [(label, str(value)) for label, value in header_info if value]
+
+                    if streaming:
+                        pdf_bytes = render_grid(agg, pagesize=A4, head=header_info, stream=True)
+                    else:
+                        styles = getSampleStyleSheet()
+                        elements = []
+
+                        for label, value in header_info:
+                            elements.append(Paragraph(f"<b>{label}</b> {value}", styles["Normal"]))
+                        elements.append(Spacer(1, 12))
+
+                        # --- Table Data ---
+                        data = [agg.columns.tolist()] + agg.values.tolist()
+
+                        table = Table(data)
+                        table.setStyle(TableStyle([
+                            ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+                            ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+                            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                            ("GRID", (0, 0), (-1, -1), 1, colors.black),
+                            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                        ]))
+
+                        elements.append(table)
+                        pdf_bytes = render_pdf(elements, pagesize=A4)
+
+                    st.download_button("⬇️ Download PDF", pdf_bytes, file_name="style_report.pdf")
+
+    # --- Stage timings for this run ---
+    if st.session_state.get("show_timings"):
+        stage_timings(run)
@@ -1,10 +1,4 @@
 import streamlit as st
-import pandas as pd
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-import tempfile
-import os
 
 st.set_page_config(page_title="Excel Style Aggregator", layout="centered")
 
@@ -13,21 +7,22 @@ st.title("👕 Excel → PDF (Style Aggregator)")
 uploaded_file = st.file_uploader("Upload your Excel file", type=["xlsx"])
 
 if uploaded_file:
+    # pandas and the parsers load once a workbook is uploaded
+    from xcel.loader import read_grid, frame_from_grid
+    from xcel.labels import LabelIndex
+
     # Load raw Excel (no header)
-    raw_df = pd.read_excel(uploaded_file, header=None)
+    raw_df = read_grid(uploaded_file)
+    labels = LabelIndex(raw_df)
 
     # Find the row index where "Style" appears
-    header_row_idx = None
-    for i, row in raw_df.iterrows():
-        if row.astype(str).str.strip().str.lower().eq("style").any():
-            header_row_idx = i
-            break
+    header_row_idx = labels.row_of("style")
 
     if header_row_idx is None:
         st.error("❌ Could not find a 'Style' header in the file.")
     else:
         # Use that row as header
-        df = pd.read_excel(uploaded_file, header=header_row_idx)
+        df = frame_from_grid(raw_df, header=header_row_idx)
         df = df.dropna(how="all")  # drop completely empty rows
 
         st.write("### Preview of extracted data")
@@ -42,28 +37,33 @@ if uploaded_file:
             st.write("### Aggregated Data (by Style)")
             st.dataframe(agg)
 
+            # Streaming lays out and writes one page at a time (flat memory for big reports)
+            streaming = st.checkbox("Stream PDF page by page", value=True)
+
             # Generate PDF
             if st.button("Generate PDF"):
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmpfile:
-                    pdf_file = tmpfile.name
-
-                doc = SimpleDocTemplate(pdf_file, pagesize=A4)
-
-                # Prepare table data
-                data = [agg.columns.tolist()] + agg.values.tolist()
-
-                table = Table(data)
-                table.setStyle(TableStyle([
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ]))
-
-                doc.build([table])
-
-                with open(pdf_file, "rb") as f:
-                    st.download_button("⬇️ Download PDF", f, file_name="style_report.pdf")
-
-                os.remove(pdf_file)
+                # ReportLab loads only when a PDF is requested
+                from reportlab.platypus import Table, TableStyle
+                from reportlab.lib import colors
+                from reportlab.lib.pagesizes import A4
+                from xcel.render import render_pdf
+                from xcel.fastgrid import render_grid
+
+                if streaming:
+                    pdf_bytes = render_grid(agg, pagesize=A4, stream=True)
+                else:
+                    # Prepare table data
+                    data = [agg.columns.tolist()] + agg.values.tolist()
+
+                    table = Table(data)
+                    table.setStyle(TableStyle([
+                        ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+                        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                        ("GRID", (0, 0), (-1, -1), 1, colors.black),
+                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                    ]))
+
+                    pdf_bytes = render_pdf([table], pagesize=A4)
+
+                st.download_button("⬇️ Download PDF", pdf_bytes, file_name="style_report.pdf")
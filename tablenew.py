@@ -1,11 +1,4 @@
 import streamlit as st
-import pandas as pd
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib.styles import getSampleStyleSheet
-import tempfile
-import os
 from datetime import datetime
 
 st.set_page_config(page_title="Excel Style Aggregator", layout="centered")
@@ -15,50 +8,32 @@ st.title("👕 Excel → PDF (Style Report)")
 uploaded_file = st.file_uploader("Upload your Excel file", type=["xlsx"])
 
 if uploaded_file:
+    # pandas and the parsers load once a workbook is uploaded
+    import pandas as pd
+    from xcel.loader import read_grid, frame_from_grid
+    from xcel.labels import LabelIndex, ORDER_LABELS
+    from xcel.aggregate import aggregate_styles
+
     # Load raw Excel (no header)
-    raw_df = pd.read_excel(uploaded_file, header=None)
+    raw_df = read_grid(uploaded_file)
 
     # --- Extract key info ---
     buyer_name = str(raw_df.iloc[0, 0]) if not pd.isna(raw_df.iloc[0, 0]) else None
-    order_no, brand, made_in, loading_port, ship_date, order_of, texture = [None]*7
-
-    for i, row in raw_df.iterrows():
-        for j, cell in enumerate(row):
-            cell_val = str(cell).strip().lower()
-            if cell_val == "order no :":
-                try: order_no = row[j+2]
-                except: pass
-            elif cell_val == "brand :":
-                try: brand = row[j+1]
-                except: pass
-            elif cell_val == "made in country :":
-                try: made_in = row[j+1]
-                except: pass
-            elif cell_val == "loading port :":
-                try: loading_port = row[j+1]
-                except: pass
-            elif cell_val == "agreed ship date :":
-                try: ship_date = row[j+2]
-                except: pass
-            elif cell_val == "order of":
-                try: order_of = row[j+1]
-                except: pass
-            elif cell_val == "texture:":
-                try: texture = row[j+1]
-                except: pass
+
+    labels = LabelIndex(raw_df)
+    meta = labels.extract({**ORDER_LABELS, "texture": ("texture:", 1)})
+    order_no, brand, made_in = meta["order_no"], meta["brand"], meta["made_in"]
+    loading_port, ship_date, order_of = meta["loading_port"], meta["ship_date"], meta["order_of"]
+    texture = meta["texture"]
 
     # --- Find header row ("Style") ---
-    header_row_idx = None
-    for i, row in raw_df.iterrows():
-        if row.astype(str).str.strip().str.lower().eq("style").any():
-            header_row_idx = i
-            break
+    header_row_idx = labels.row_of("style")
 
     if header_row_idx is None:
         st.error("❌ Could not find a 'Style' header in the file.")
     else:
         # Use that row as header
-        df = pd.read_excel(uploaded_file, header=header_row_idx)
+        df = frame_from_grid(raw_df, header=header_row_idx)
         df = df.dropna(how="all")
 
         st.write("### Preview of extracted data")
@@ -76,41 +51,32 @@ if uploaded_file:
                 if "fob" in str(col).strip().lower():
                     fob_col = col
 
-        # --- Aggregate by Style ---
-grouped = df.groupby("Style", as_index=False)
-
-final_rows = []
-for style, group in grouped:
-    # Pick first description + composition
-    item_desc = group.iloc[0, 1] if group.shape[1] > 1 else ""
-    composition = group.iloc[0, 2] if group.shape[1] > 2 else ""
-
-    # Sum QTY
-    qty = group[qty_col].sum() if qty_col else 0
-
-    # FOB (assume same across rows, pick first non-NaN)
-    price = group[fob_col].dropna().iloc[0] if fob_col and not group[fob_col].dropna().empty else 0
-
-    amount = float(qty) * float(price)
-
-    final_rows.append([
-        style,                                # STYLE NO
-        item_desc,                            # ITEM DESCRIPTION
-        texture if texture else "",           # FABRIC TYPE
-        "61112000",                           # H.S NO
-        composition,                          # COMPOSITION
-        made_in if made_in else "",           # COUNTRY OF ORIGIN
-        qty,                                  # QTY (aggregated)
-        price,                                # FOB PRICE
-        amount                                # AMOUNT
-    ])
+            # --- Aggregate by Style (sorted, first FOB price present) ---
+            agg = aggregate_styles(df, "Style", qty_col, fob_col, sort=True, nonzero_price=False)
+
+            final_rows = []
+            for style, item_desc, composition, qty, price, amount in agg.itertuples(index=False):
+                final_rows.append([
+                    style,                                # STYLE NO
+                    item_desc,                            # ITEM DESCRIPTION
+                    texture if texture else "",           # FABRIC TYPE
+                    "61112000",                           # H.S NO
+                    composition,                          # COMPOSITION
+                    made_in if made_in else "",           # COUNTRY OF ORIGIN
+                    qty,                                  # QTY (aggregated)
+                    price,                                # FOB PRICE
+                    amount                                # AMOUNT
+                ])
 
             # Generate PDF
             if st.button("Generate PDF"):
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmpfile:
-                    pdf_file = tmpfile.name
+                # ReportLab loads only when a PDF is requested
+                from reportlab.platypus import Table, TableStyle, Paragraph, Spacer
+                from reportlab.lib import colors
+                from reportlab.lib.pagesizes import A4, landscape
+                from reportlab.lib.styles import getSampleStyleSheet
+                from xcel.render import render_pdf
 
-                doc = SimpleDocTemplate(pdf_file, pagesize=landscape(A4))
                 styles = getSampleStyleSheet()
                 elements = []
 
@@ -150,9 +116,6 @@ for style, group in grouped:
                 ]))
 
                 elements.append(table)
-                doc.build(elements)
-
-                with open(pdf_file, "rb") as f:
-                    st.download_button("⬇️ Download PDF", f, file_name="style_report.pdf")
+                pdf_bytes = render_pdf(elements, pagesize=landscape(A4))
 
-                os.remove(pdf_file)
+                st.download_button("⬇️ Download PDF", pdf_bytes, file_name="style_report.pdf")
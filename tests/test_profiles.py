@@ -0,0 +1,68 @@
+import io
+import math
+
+import pytest
+from openpyxl import load_workbook
+
+from benchmarks.workbook import make_order_workbook
+from xcel.cache import ResultCache
+from xcel.pipeline import parse_planned, parse_proforma
+from xcel.profiles import compile_profile, learn_profile
+
+HEADER_ROW = 7  # the synthetic workbook's two-row header sits on rows 7-8
+
+
+def _edit(data, edit):
+    wb = load_workbook(io.BytesIO(data))
+    edit(wb.active)
+    out = io.BytesIO()
+    wb.save(out)
+    return out.getvalue()
+
+
+def _numeric_styles_with_blank_row(ws):
+    for r in range(HEADER_ROW + 2, ws.max_row + 1):
+        ws.cell(r, 1).value = 1000 + r % 13
+    ws.insert_rows(HEADER_ROW + 5)
+
+
+def _blank_made_in(ws):
+    ws["B3"] = None
+
+
+WORKBOOKS = {
+    "synthetic": make_order_workbook(rows=120, styles=15),
+    "numeric styles, blank row": _edit(make_order_workbook(rows=120, styles=15), _numeric_styles_with_blank_row),
+    "blank label value": _edit(make_order_workbook(rows=120, styles=15), _blank_made_in),
+}
+
+
+def _same(planned, expected):
+    assert planned["agg_df"].equals(expected["agg_df"])
+    assert planned.keys() == expected.keys()
+    for key in expected:
+        if key != "agg_df":
+            a, b = planned[key], expected[key]
+            assert a == b or (isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b)), key
+
+
+@pytest.mark.parametrize("name", list(WORKBOOKS))
+def test_profile_plan_matches_heuristic_parse(name):
+    data = WORKBOOKS[name]
+    plan = compile_profile(learn_profile(io.BytesIO(data), "test"))
+    _same(parse_planned(io.BytesIO(data), [plan]), parse_proforma(io.BytesIO(data)))
+
+
+@pytest.mark.parametrize("name", list(WORKBOOKS))
+def test_learned_layout_matches_heuristic_parse(name):
+    data = WORKBOOKS[name]
+    layouts = ResultCache()
+    expected = parse_proforma(io.BytesIO(data), layouts=layouts)
+    assert len(layouts) == 1
+    _same(parse_planned(io.BytesIO(data), [], layouts), expected)
+
+
+def test_other_layout_falls_back():
+    plan = compile_profile(learn_profile(io.BytesIO(WORKBOOKS["synthetic"]), "test"))
+    other = make_order_workbook(rows=50, styles=5, columns=8)
+    assert parse_planned(io.BytesIO(other), [plan]) is None
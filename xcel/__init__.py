@@ -0,0 +1,36 @@
+# Shared parsing / rendering code used by the Streamlit apps.
+#
+# pandas and ReportLab are imported on first use, not when the package is:
+# apps do `import xcel` and call xcel.load_proforma(...) /
+# xcel.render_proforma(...), so a fresh session draws the upload widget
+# without either library, parsing pulls in pandas and only generating a PDF
+# loads ReportLab. Submodules can still be imported directly.
+import importlib
+
+_LAZY = {
+    "ParseError": "xcel.pipeline",
+    "load_proforma": "xcel.pipeline",
+    "parse_proforma": "xcel.pipeline",
+    "render_proforma": "xcel.proforma",
+    "build_proforma": "xcel.proforma",
+    "render_proforma_cached": "xcel.proforma",
+    "invoice_model": "xcel.model",
+    "model_hash": "xcel.model",
+    "render_pdf": "xcel.render",
+    "render_grid": "xcel.fastgrid",
+    "amount_to_words": "xcel.words",
+    "number_to_words": "xcel.words",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module 'xcel' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
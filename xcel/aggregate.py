@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from xcel.timing import stage
+
+PROFORMA_COLUMNS = ["STYLE NO.", "ITEM DESCRIPTION", "FABRIC TYPE", "H.S NO", "COMPOSITION", "ORIGIN", "QTY", "FOB", "AMOUNT"]
+HS_CODE = "61112000"
+
+
+# --- One grouped pass over the item rows ---
+# Per style (in order of first appearance): description / composition from the
+# first row, summed qty, first non-zero FOB price and amount = qty x price.
+# sort=True orders the styles like groupby does; nonzero_price=False takes the
+# first FOB price present (non-NaN), zero included.
+def aggregate_styles(df, style_col, qty_col=None, fob_col=None, desc_pos=1, comp_pos=2, sort=False, nonzero_price=True):
+    with stage("aggregate") as s:
+        agg = _aggregate_styles(df, style_col, qty_col, fob_col, desc_pos, comp_pos, sort, nonzero_price)
+        s["rows"] = len(df)
+    return agg
+
+
+def _aggregate_styles(df, style_col, qty_col, fob_col, desc_pos, comp_pos, sort, nonzero_price):
+    df = df[df[style_col].notna()]
+    codes, styles = pd.factorize(df[style_col], sort=sort)
+    n = len(styles)
+    first_rows = df.iloc[np.unique(codes, return_index=True)[1]]
+
+    def first_cell(pos):
+        if df.shape[1] > pos:
+            return first_rows.iloc[:, pos].to_numpy()
+        return [""] * n
+
+    if qty_col is not None and qty_col in df.columns:
+        qty = pd.to_numeric(df[qty_col], errors="coerce").fillna(0)
+        total_qty = qty.groupby(codes).sum().reindex(range(n), fill_value=0).to_numpy()
+    else:
+        total_qty = np.zeros(n, dtype=int)
+
+    unit_price = np.zeros(n, dtype=int)
+    if fob_col is not None and fob_col in df.columns:
+        prices = pd.to_numeric(df[fob_col], errors="coerce")
+        usable = (prices.fillna(0) > 0 if nonzero_price else prices.notna()).to_numpy()
+        prices = prices.fillna(0).to_numpy()
+        groups, first_pos = np.unique(codes[usable], return_index=True)
+        unit_price = np.zeros(n, dtype=prices.dtype)
+        unit_price[groups] = prices[usable][first_pos]
+
+    return pd.DataFrame({
+        "style": np.asarray(styles, dtype=object),
+        "description": first_cell(desc_pos),
+        "composition": first_cell(comp_pos),
+        "qty": total_qty,
+        "unit_price": unit_price,
+        "amount": total_qty * unit_price,
+    })
+
+
+# --- agg_df schema the proforma renderers expect ---
+def to_proforma(agg, texture=None, origin=None):
+    return pd.DataFrame({
+        "STYLE NO.": agg["style"],
+        "ITEM DESCRIPTION": agg["description"],
+        "FABRIC TYPE": texture or "Knitted",
+        "H.S NO": HS_CODE,
+        "COMPOSITION": agg["composition"],
+        "ORIGIN": origin or "India",
+        "QTY": agg["qty"].astype(int),
+        "FOB": [f"{p:.2f}" for p in agg["unit_price"]],
+        "AMOUNT": [f"{a:.2f}" for a in agg["amount"]],
+    }, columns=PROFORMA_COLUMNS)
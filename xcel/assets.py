@@ -0,0 +1,116 @@
+import copy
+import io
+import os
+import threading
+
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfdoc
+from reportlab.pdfgen.canvas import _digester
+from reportlab.platypus.flowables import Flowable
+
+
+# --- Brand images (logo / signature) decoded once per process ---
+# Keyed by absolute path; an entry is reused while the file's mtime and size
+# are unchanged and rebuilt when the file is replaced on disk.
+class ImageAsset:
+    def __init__(self, path, stamp, data):
+        self.path, self.stamp = path, stamp
+        self.reader = ImageReader(io.BytesIO(data))
+        self.width, self.height = self.reader.getSize()
+        # same name canvas.drawImage gives an ImageReader with mask="auto",
+        # so the image is still embedded only once per document
+        rawdata = self.reader.getRGBData()
+        smask = self.reader._dataA
+        mdata = smask.getRGBData() if smask else b"auto"
+        self.name = _digester(rawdata + mdata)
+        # decoded + compressed XObject; each document gets a shallow copy
+        self._xobject = pdfdoc.PDFImageXObject(self.name, self.reader, mask="auto")
+
+    # still the file on disk (same mtime and size)?
+    def current(self):
+        try:
+            return _stamp(self.path) == self.stamp
+        except OSError:
+            return False
+
+    def register(self, canv):
+        doc = canv._doc
+        reg_name = doc.getXObjectName(self.name)
+        if doc.idToObject.get(reg_name) is None:
+            img = copy.copy(self._xobject)
+            smask = img.__dict__.pop("_smask", None)
+            canv._setXObjects(img)
+            doc.Reference(img, reg_name)
+            doc.addForm(self.name, img)
+            if smask is not None:
+                mask_name = doc.getXObjectName(smask.name)
+                if doc.idToObject.get(mask_name) is None:
+                    smask = copy.copy(smask)
+                    canv._setXObjects(smask)
+                    img.smask = doc.Reference(smask, mask_name)
+                else:
+                    img.smask = pdfdoc.PDFObjectReference(mask_name)
+        return reg_name
+
+    def draw(self, canv, x, y, width, height):
+        reg_name = self.register(canv)
+        canv._currentPageHasImages = 1
+        canv.saveState()
+        canv.translate(x, y)
+        canv.scale(width, height)
+        canv._code.append("/%s Do" % reg_name)
+        canv.restoreState()
+        canv._formsinuse.append(self.name)
+
+
+_images = {}
+_lock = threading.Lock()
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def load_image(path):
+    path = os.path.abspath(path)
+    stamp = _stamp(path)
+    with _lock:
+        asset = _images.get(path)
+        if asset is not None and asset.stamp == stamp:
+            return asset
+    with open(path, "rb") as f:
+        asset = ImageAsset(path, stamp, f.read())
+    with _lock:
+        _images[path] = asset
+    return asset
+
+
+def image_by_name(name):
+    with _lock:
+        return next((a for a in _images.values() if a.name == name), None)
+
+
+def image_reader(path):
+    return load_image(path).reader
+
+
+def clear_images():
+    with _lock:
+        _images.clear()
+
+
+# drop-in for platypus.Image(path, width, height) backed by the asset cache
+class AssetImage(Flowable):
+    def __init__(self, path, width=None, height=None, hAlign="CENTER"):
+        super().__init__()
+        self.asset = load_image(path)
+        self.drawWidth = width or self.asset.width
+        self.drawHeight = height or self.asset.height
+        self.hAlign = hAlign
+
+    def wrap(self, availWidth, availHeight):
+        return self.drawWidth, self.drawHeight
+
+    def draw(self):
+        self.asset.draw(self.canv, 0, 0, self.drawWidth, self.drawHeight)
@@ -0,0 +1,89 @@
+import io
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from xcel import timing
+
+
+# app name -> proforma theme
+TEMPLATES = {"saram": "master", "neo": "dark"}
+
+
+# --- PI numbers for a batch: SAR/LG/0001 Dt. dd/mm/YYYY, SAR/LG/0002 ... ---
+def pi_sequence(prefix="SAR/LG/", start=1, width=4, date=None):
+    date = date or datetime.today().strftime("%d/%m/%Y")
+    n = start
+    while True:
+        yield f"{prefix}{n:0{width}d} Dt. {date}"
+        n += 1
+
+
+# --- One workbook: parse -> aggregate -> render (runs inside a pool worker) ---
+# Never raises; failures come back as a status row so one bad file does not
+# sink the whole batch.
+def render_one(name, data, fields, theme="master"):
+    from xcel.pipeline import ParseError, load_proforma
+    from xcel.proforma import render_proforma_cached
+
+    started = time.perf_counter()
+    result = {"file": name, "pi_no": fields.get("pi_no"), "status": "ok", "error": "",
+              "styles": 0, "pdf": None}
+    with timing.request("batch", file=name, theme=theme) as req:
+        try:
+            order = load_proforma(data)
+            result["order_no"] = order["order_no"]
+            result["styles"] = len(order["agg_df"])
+            result["pdf"] = render_proforma_cached(order, fields, theme=theme)
+        except ParseError as e:
+            result["status"], result["error"] = "error", str(e)
+        except Exception as e:
+            result["status"], result["error"] = "error", f"{type(e).__name__}: {e}"
+        req.context["status"] = result["status"]
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+# files: iterable of (name, bytes). Results come back in input order.
+# ReportLab layout is CPU-bound and holds the GIL, so workers are processes;
+# "spawn" keeps them safe to start from Streamlit's threaded server.
+def render_batch(files, fields, pi_numbers=None, theme="master", jobs=None):
+    files = list(files)
+    pi_numbers = pi_sequence() if pi_numbers is None else iter(pi_numbers)
+    tasks = [(name, data, {**fields, "pi_no": next(pi_numbers)}, theme) for name, data in files]
+    jobs = min(jobs or os.cpu_count() or 1, len(tasks)) or 1
+    if jobs == 1:
+        return [render_one(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(render_one, *task) for task in tasks]
+        return [f.result() for f in futures]
+
+
+def status_report(results):
+    import pandas as pd
+
+    cols = ["file", "order_no", "pi_no", "styles", "status", "error", "seconds"]
+    return pd.DataFrame([{c: r.get(c) for c in cols} for r in results], columns=cols)
+
+
+def pdf_name(result):
+    return os.path.splitext(os.path.basename(result["file"]))[0] + ".pdf"
+
+
+# zip of every rendered PDF plus status.csv
+def zip_results(results):
+    out = io.BytesIO()
+    seen = set()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i, r in enumerate(results, 1):
+            if r["pdf"] is not None:
+                name = pdf_name(r)
+                if name in seen:  # same workbook name uploaded twice
+                    name = f"{i:03d}_{name}"
+                seen.add(name)
+                zf.writestr(name, r["pdf"])
+        zf.writestr("status.csv", status_report(results).to_csv(index=False))
+    return out.getvalue()
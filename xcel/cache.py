@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+# --- Cache key: SHA-256 of the uploaded bytes plus the settings used on them ---
+def content_key(data, **settings):
+    h = hashlib.sha256(data)
+    h.update(json.dumps(settings, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+# --- Bounded in-memory LRU, optionally backed by a directory of pickles ---
+# One instance lives at module level, so every Streamlit session in the
+# server process shares it. Cached values are shared too: treat them as read-only.
+# With max_bytes, entries are also evicted (oldest first) once the sum of
+# sizeof(value) exceeds it; a single value larger than the limit is not kept.
+# max_disk_bytes bounds the directory the same way: after each write the least
+# recently used pickles (by file atime / mtime; a disk hit touches the file) go
+# first until the rest fit. Without it the directory grows without limit.
+class ResultCache:
+    def __init__(self, max_entries=32, directory=None, max_bytes=None, sizeof=len, max_disk_bytes=None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_bytes, self.sizeof = max_bytes, sizeof
+        self.max_disk_bytes = max_disk_bytes
+        self.nbytes = 0
+        self.hits = self.misses = 0
+        self._items = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._items)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pkl")
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+
+        value = self._load(key) if self.directory else None
+        if value is None:
+            with self._lock:
+                self.misses += 1
+            return default
+        self._remember(key, value)
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self._remember(key, value)
+        if self.directory:
+            self._store(key, value)
+        return value
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+
+    def _remember(self, key, value):
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            self.nbytes -= self._sizes.pop(key, 0)
+            self._items.pop(key, None)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._items[key] = value
+            self._sizes[key] = size
+            self.nbytes += size
+            while len(self._items) > self.max_entries or (self.max_bytes is not None and self.nbytes > self.max_bytes):
+                old, _ = self._items.popitem(last=False)
+                self.nbytes -= self._sizes.pop(old)
+
+    def _load(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                value = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            return None
+        if self.max_disk_bytes is not None:
+            try:
+                os.utime(self._path(key))  # atime is often not kept (noatime / relatime)
+            except OSError:
+                pass
+        return value
+
+    def _store(self, key, value):
+        # write to a temp file first so a concurrent reader never sees half a pickle
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except BaseException as e:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            if not isinstance(e, Exception):  # KeyboardInterrupt / SystemExit
+                raise
+            return  # full disk or unpicklable value: the entry stays memory-only
+        if self.max_disk_bytes is not None:
+            self._prune()
+
+    def _prune(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".pkl"):
+                    try:
+                        st = entry.stat()
+                    except OSError:  # removed by another process
+                        continue
+                    entries.append((max(st.st_atime_ns, st.st_mtime_ns), st.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+
+PARSE_CACHE = ResultCache(
+    max_entries=int(os.environ.get("XCEL_PARSE_CACHE_SIZE", "32")),
+    directory=os.environ.get("XCEL_CACHE_DIR") or None,
+)
+
+# layouts detected on earlier uploads, as addressed profiles, by layout fingerprint (xcel.profiles)
+LAYOUT_CACHE = ResultCache(
+    max_entries=int(os.environ.get("XCEL_LAYOUT_CACHE_SIZE", "256")),
+    directory=os.path.join(os.environ["XCEL_CACHE_DIR"], "layout") if os.environ.get("XCEL_CACHE_DIR") else None,
+)
+
+# rendered proforma PDFs by invoice model hash (xcel.model), bounded by total size
+RENDER_CACHE = ResultCache(
+    max_entries=int(os.environ.get("XCEL_RENDER_CACHE_SIZE", "256")),
+    directory=os.path.join(os.environ["XCEL_CACHE_DIR"], "pdf") if os.environ.get("XCEL_CACHE_DIR") else None,
+    max_bytes=int(float(os.environ.get("XCEL_RENDER_CACHE_MB", "64")) * 1024 * 1024),
+    max_disk_bytes=int(float(os.environ.get("XCEL_RENDER_CACHE_DISK_MB", "512")) * 1024 * 1024),
+)
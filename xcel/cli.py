@@ -0,0 +1,272 @@
+import argparse
+import glob
+import io
+import json
+import os
+import sys
+from collections import Counter
+
+from xcel.batch import TEMPLATES, pdf_name, pi_sequence, render_batch, status_report
+from xcel.cache import content_key
+from xcel.model import FIELD_DEFAULTS, RENDER_VERSION
+
+
+# --- Headless folder -> PDF conversion: python -m xcel render orders/*.xlsx --out pdfs/ ---
+# Same parsing and rendering code as the Streamlit apps (via xcel.batch),
+# without importing Streamlit.
+
+# invoice fields shared by every PI in a run (the PI number is assigned per input)
+FIELDS = {k: v for k, v in FIELD_DEFAULTS.items() if k != "pi_no"}
+
+# out/<MANIFEST> remembers, per input path, the PDF it was rendered to and from what
+MANIFEST = ".xcel-render.json"
+
+
+def expand_inputs(paths):
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            files += sorted(glob.glob(os.path.join(p, "*.xlsx")))
+        else:
+            files += sorted(glob.glob(p)) or [p]
+    # skip Excel's ~$lock files; keep the first occurrence of each path
+    return list(dict.fromkeys(f for f in files if not os.path.basename(f).startswith("~$")))
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+# PDF name per input: the workbook's name, or for inputs whose names clash,
+# its path below their common folder ("a/order.xlsx" -> "a_order.pdf").
+def output_names(paths):
+    names = {p: pdf_name({"file": p}) for p in paths}
+    taken = Counter(names.values())
+    clashing = [p for p in paths if taken[names[p]] > 1]
+    if clashing:
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in clashing])
+        for p in clashing:
+            names[p] = pdf_name({"file": os.path.relpath(os.path.abspath(p), root).replace(os.sep, "_")})
+    return names
+
+
+# An input is up to date when its PDF exists and was rendered from the same
+# bytes, template, invoice fields and PI number by the same parser and renderer versions.
+def render_key(data, theme, fields):
+    from xcel.pipeline import PIPELINE_VERSION
+
+    return content_key(data, theme=theme, fields=fields, version=(PIPELINE_VERSION, RENDER_VERSION))
+
+
+def render(args):
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("no input workbooks", file=sys.stderr)
+        return 2
+    os.makedirs(args.out, exist_ok=True)
+    theme = TEMPLATES[args.template]
+    shared = {name: getattr(args, name) for name in FIELDS}
+    manifest = {} if args.force else load_manifest(args.out)
+
+    names = output_names(paths)
+    owners = {}
+    for path in paths:
+        owners.setdefault(names[path], []).append(path)
+
+    # PI numbers follow input order, skipped inputs included, so a rerun
+    # gives every workbook the same number as before
+    todo, skipped, failed = [], 0, 0
+    for path, pi_no in zip(paths, pi_sequence(args.pi_prefix, args.pi_start, date=args.date)):
+        name = names[path]
+        if len(owners[name]) > 1:
+            failed += 1
+            others = ", ".join(p for p in owners[name] if p != path)
+            print(f"FAIL {path}: output {name} is also the output of {others}", file=sys.stderr)
+            continue
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            failed += 1
+            print(f"FAIL {path}: {e}", file=sys.stderr)
+            continue
+        fields = {**shared, "pi_no": pi_no}
+        key = render_key(data, theme, fields)
+        entry = manifest.get(os.path.abspath(path))
+        if entry == {"pdf": name, "key": key} and os.path.exists(os.path.join(args.out, name)):
+            skipped += 1
+            continue
+        todo.append((path, data, pi_no, key))
+
+    results = render_batch([(p, d) for p, d, _, _ in todo], shared,
+                           pi_numbers=[pi for _, _, pi, _ in todo], theme=theme, jobs=args.jobs)
+    for (path, _, _, key), result in zip(todo, results):
+        name = names[path]
+        if result["pdf"] is None:
+            failed += 1
+            manifest.pop(os.path.abspath(path), None)
+            print(f"FAIL {path}: {result['error']}", file=sys.stderr)
+            continue
+        with open(os.path.join(args.out, name), "wb") as f:
+            f.write(result["pdf"])
+        manifest[os.path.abspath(path)] = {"pdf": name, "key": key}
+        if args.verbose:
+            print(f"ok   {path} -> {name} ({result['styles']} styles, {result['seconds']}s)")
+    save_manifest(args.out, manifest)
+
+    if args.status:
+        status_report(results).to_csv(args.status, index=False)
+    rendered = sum(r["pdf"] is not None for r in results)
+    print(f"{rendered} rendered, {skipped} up to date, {failed} failed")
+    return 1 if failed else 0
+
+
+# --- python -m xcel profile-layout order.xlsx: wrap/split/draw time per section ---
+def profile_layout(args):
+    from xcel.layoutprof import profile
+    from xcel.pipeline import ParseError, load_proforma
+    from xcel.proforma import render_proforma
+
+    try:
+        with open(args.workbook, "rb") as f:
+            order = load_proforma(f.read())
+    except (OSError, ParseError) as e:
+        print(f"FAIL {args.workbook}: {e}", file=sys.stderr)
+        return 1
+    fields = {k: getattr(args, k) for k in FIELDS}
+    options = {} if args.template != "saram" else {"static_chrome": not args.no_static_chrome}
+    for _ in range(args.warmup):  # first renders also build the static chrome, fonts and images
+        render_proforma(order, fields, TEMPLATES[args.template], **options)
+    with profile() as prof:
+        render_proforma(order, fields, TEMPLATES[args.template], **options)
+
+    print("section                    self ms")
+    for name, ms in prof.sections().items():
+        print(f"  {name:<24} {ms:8.1f}")
+    print(f"\n{'section':<24} {'flowable':<18} {'op':<6} {'calls':>7} {'total ms':>9} {'self ms':>9}")
+    for r in prof.table()[:args.top]:
+        print(f"{r['section']:<24} {r['flowable']:<18} {r['op']:<6} {r['calls']:>7} {r['total_ms']:>9.1f} {r['self_ms']:>9.1f}")
+    if args.folded:
+        with open(args.folded, "w", encoding="utf-8") as f:
+            f.write(prof.folded())
+    return 0
+
+
+# --- python -m xcel learn-profile order.xlsx --name landmark --out profiles/ ---
+def learn_profile(args):
+    from xcel.profiles import ProfileError, learn_profile as learn
+
+    try:
+        with open(args.workbook, "rb") as f:
+            profile = learn(f, args.name)
+    except (OSError, ProfileError) as e:
+        print(f"FAIL {args.workbook}: {e}", file=sys.stderr)
+        return 1
+    text = json.dumps(profile, indent=1, default=str) + "\n"
+    if args.out is None:
+        sys.stdout.write(text)
+        return 0
+    path = os.path.join(args.out, args.name + ".json") if os.path.isdir(args.out) else args.out
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    print(f"wrote {path}")
+    return 0
+
+
+# blank label values are NaN on both sides, and NaN != NaN
+def _same_value(a, b):
+    import pandas as pd
+
+    return a == b or (pd.isna(a) and pd.isna(b))
+
+
+# --- python -m xcel check-profile orders/*.xlsx: which profile reads each workbook, and does it agree ---
+def check_profile(args):
+    from xcel.pipeline import ParseError, order_from_plan, parse_proforma
+    from xcel.profiles import compile_profiles, load_profiles, run_plans
+
+    plans = compile_profiles(load_profiles(args.dir))
+    if not plans:
+        print(f"no compiled profiles in {args.dir!r}", file=sys.stderr)
+        return 2
+    failed = 0
+    for path in expand_inputs(args.inputs):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            planned = run_plans(plans, io.BytesIO(data))
+            if planned is None:
+                print(f"none {path}")
+                continue
+            plan = planned[0]
+            order, expected = order_from_plan(*planned), parse_proforma(io.BytesIO(data))
+        except (OSError, ParseError) as e:
+            failed += 1
+            print(f"FAIL {path}: {e}", file=sys.stderr)
+            continue
+        same = order.pop("agg_df").equals(expected.pop("agg_df")) and order.keys() == expected.keys() \
+            and all(_same_value(order[k], expected[k]) for k in order)
+        failed += not same
+        print(f"{'ok  ' if same else 'DIFF'} {path}: {plan.name}")
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m xcel", description="Excel order workbooks -> proforma invoice PDFs")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("render", help="render proforma invoices for workbooks or folders of workbooks")
+    p.add_argument("inputs", nargs="+", help="workbooks, folders or glob patterns")
+    p.add_argument("--out", "-o", default=".", help="output folder (default: current folder)")
+    p.add_argument("--template", "-t", choices=list(TEMPLATES), default="saram")
+    p.add_argument("--jobs", "-j", type=int, default=None, help="worker processes (default: CPU count)")
+    p.add_argument("--force", action="store_true", help="re-render inputs that are already up to date")
+    p.add_argument("--status", metavar="CSV", help="also write the per-file status report")
+    p.add_argument("--verbose", "-v", action="store_true")
+    p.add_argument("--pi-prefix", default="SAR/LG/")
+    p.add_argument("--pi-start", type=int, default=1)
+    p.add_argument("--date", default=None, help="PI date, dd/mm/YYYY (default: today)")
+    for name, default in FIELDS.items():
+        p.add_argument("--" + name.replace("_", "-"), dest=name, default=default)
+    p.set_defaults(func=render)
+
+    p = sub.add_parser("profile-layout", help="count and time wrap/split/draw per layout section for one workbook")
+    p.add_argument("workbook")
+    p.add_argument("--template", "-t", choices=list(TEMPLATES), default="saram")
+    p.add_argument("--no-static-chrome", action="store_true",
+                   help="lay the saram header and footer out with platypus on every render, as before the chrome cache")
+    p.add_argument("--warmup", type=int, default=1, help="unprofiled renders first (default 1)")
+    p.add_argument("--top", type=int, default=20, help="rows of the per-flowable table")
+    p.add_argument("--folded", metavar="PATH", help="write folded stacks (flamegraph.pl / speedscope) here")
+    for name, default in FIELDS.items():
+        p.add_argument("--" + name.replace("_", "-"), dest=name, default=default)
+    p.set_defaults(func=profile_layout)
+
+    p = sub.add_parser("learn-profile", help="write an extraction profile with the cell addresses of one sample workbook")
+    p.add_argument("workbook")
+    p.add_argument("--name", required=True, help="profile name, e.g. the buyer")
+    p.add_argument("--out", "-o", help="file or folder to write the JSON profile to (default: stdout)")
+    p.set_defaults(func=learn_profile)
+
+    p = sub.add_parser("check-profile", help="show which profile reads each workbook and compare it with the heuristic parse")
+    p.add_argument("inputs", nargs="+", help="workbooks, folders or glob patterns")
+    p.add_argument("--dir", default=os.environ.get("XCEL_PROFILE_DIR", "profiles"),
+                   help="profile folder (default: $XCEL_PROFILE_DIR or ./profiles)")
+    p.set_defaults(func=check_profile)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,188 @@
+import io
+from types import SimpleNamespace
+
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import getFont, stringWidth
+
+from xcel.pdfstream import PDFStreamWriter
+from xcel.render import TimedCanvas
+from xcel.timing import stage
+
+
+# --- Plain grid reports drawn straight onto the page ---
+# Looks like Table(data) + GRID / grey header as used by xcelapp.py, laid out
+# the way SimpleDocTemplate would (1" margins, 6pt frame padding, table
+# centred, header only on the first page), but without platypus: column
+# widths are measured once per distinct string, every row is 18pt high and
+# each page is written as one block of PDF operators (a text object plus the
+# grid lines), so build time is linear in the number of rows.
+GRID_STYLE = SimpleNamespace(
+    font="Helvetica", header_font="Helvetica-Bold", size=10, leading=12,
+    padding=(6, 6, 3, 3),  # left, right, top, bottom (Table defaults)
+    header_bg=colors.grey, header_fg=colors.whitesmoke, text=colors.black,
+    grid_width=1, grid_color=colors.black,
+    repeat_header=False,
+)
+
+
+def row_height(style=GRID_STYLE):
+    _, _, top, bottom = style.padding
+    return style.leading + top + bottom
+
+
+class _Metrics:
+    # per-character advance widths for a standard (non-embedded) font
+    def __init__(self, font, size):
+        self.font, self.size = font, size
+        widths = getFont(font).widths
+        self.chars = {chr(i): widths[i] * size / 1000.0 for i in range(32, 127)}
+
+    def width(self, s):
+        chars = self.chars
+        try:
+            return sum([chars[c] for c in s])
+        except KeyError:
+            return stringWidth(s, self.font, self.size)
+
+
+def column_widths(frame, style=GRID_STYLE):
+    left, right, _, _ = style.padding
+    body, bold = _Metrics(style.font, style.size), _Metrics(style.header_font, style.size)
+    widths = []
+    for j, name in enumerate(frame.columns):
+        cells = pd.unique(frame.iloc[:, j].map(str).to_numpy(object))
+        w = max((body.width(s) for s in cells), default=0)
+        widths.append(max(w, bold.width(str(name))) + left + right)
+    return widths
+
+
+def frame_rows(frame):
+    for row in frame.itertuples(index=False, name=None):
+        yield [str(v) for v in row]
+
+
+def _escape(s):
+    s = s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    if s.isascii():
+        return s
+    # standard fonts are WinAnsi encoded; keep the stream 7-bit with octal escapes
+    return "".join(chr(b) if b < 128 else "\\%03o" % b for b in s.encode("cp1252", "replace"))
+
+
+def _rgb(color):
+    return "%.4g %.4g %.4g" % color.rgb()
+
+
+def page_frame(pagesize=A4, margins=(inch,) * 4, padding=6):
+    left, right, top, bottom = margins
+    return (left + padding, bottom + padding,
+            pagesize[0] - left - right - 2 * padding, pagesize[1] - top - bottom - 2 * padding)
+
+
+# Yields one string of content-stream operators per page. `fonts` maps the
+# style's font names to the resource names the writer registered (/F1, ...).
+# `head` is an optional list of (bold label, text) lines shown above the
+# table on the first page, like the Paragraph + Spacer(1, 12) blocks of the
+# style report apps.
+def grid_pages(header, rows, widths, fonts, pagesize=A4, margins=(inch,) * 4, style=GRID_STYLE, head=()):
+    fx, fy, fw, fh = page_frame(pagesize, margins)
+    rh = row_height(style)
+    head_h = (len(head) + 1) * style.leading if head else 0
+    x0 = fx + (fw - sum(widths)) / 2
+    xs = [x0]
+    for w in widths:
+        xs.append(xs[-1] + w)
+    centres = [(a + b) / 2 for a, b in zip(xs, xs[1:])]
+    baseline = style.padding[3] + style.leading - style.size
+    top = fy + fh
+    body, bold = _Metrics(style.font, style.size), _Metrics(style.header_font, style.size)
+    header = [str(h) for h in header]
+
+    def head_ops():
+        ops = ["BT"]
+        for i, (label, text) in enumerate(head):
+            ops.append("1 0 0 1 %.2f %.2f Tm" % (fx, top - i * style.leading - style.size))
+            if label:
+                ops.append("%s %g Tf (%s) Tj" % (fonts[style.header_font], style.size, _escape(label)))
+            ops.append("%s %g Tf (%s) Tj" % (fonts[style.font], style.size, _escape(" " + text if label else text)))
+        ops.append("ET")
+        return ops
+
+    def page_ops(page, with_header, first):
+        top = fy + fh - (head_h if first else 0)
+        n = len(page) + with_header
+        ops = head_ops() if first and head else []
+        if with_header:
+            ops.append("%s rg %.2f %.2f %.2f %.2f re f" % (_rgb(style.header_bg), x0, top - rh, xs[-1] - x0, rh))
+        ops.append("BT")
+        y = top - rh + baseline
+        if with_header:
+            ops.append("%s %g Tf %s rg" % (fonts[style.header_font], style.size, _rgb(style.header_fg)))
+            for c, s in zip(centres, header):
+                ops.append("1 0 0 1 %.2f %.2f Tm (%s) Tj" % (c - bold.width(s) / 2, y, _escape(s)))
+            y -= rh
+        ops.append("%s %g Tf %s rg" % (fonts[style.font], style.size, _rgb(style.text)))
+        width = body.width
+        for row in page:
+            for c, s in zip(centres, row):
+                ops.append("1 0 0 1 %.2f %.2f Tm (%s) Tj" % (c - width(s) / 2, y, _escape(s)))
+            y -= rh
+        ops.append("ET")
+        ops.append("%s RG %g w" % (_rgb(style.grid_color), style.grid_width))
+        bottom = top - n * rh
+        for x in xs:
+            ops.append("%.2f %.2f m %.2f %.2f l" % (x, top, x, bottom))
+        for i in range(n + 1):
+            ops.append("%.2f %.2f m %.2f %.2f l" % (x0, top - i * rh, xs[-1], top - i * rh))
+        ops.append("S")
+        return "\n".join(ops)
+
+    page, with_header, pages = [], True, 0
+    room = max(1, int((fh - head_h) // rh))
+    for row in rows:
+        page.append(row)
+        if len(page) + with_header == room:
+            yield page_ops(page, with_header, not pages)
+            page, with_header, pages = [], style.repeat_header, pages + 1
+            room = max(1, int(fh // rh))
+    if page or not pages:
+        yield page_ops(page, with_header, not pages)
+
+
+def draw_grid(canv, header, rows, widths, pagesize=A4, margins=(inch,) * 4, style=GRID_STYLE, head=()):
+    fonts = {}
+    for name in (style.header_font, style.font):
+        canv.setFont(name, style.size)
+        fonts[name] = canv._doc.getInternalFontName(name)
+    for ops in grid_pages(header, rows, widths, fonts, pagesize, margins, style, head):
+        canv.addLiteral(ops)
+        canv.showPage()
+
+
+def render_grid(frame, sink=None, pagesize=A4, margins=(inch,) * 4, style=GRID_STYLE, widths=None, head=(), stream=False):
+    out = io.BytesIO() if sink is None else sink
+    with stage("layout") as s:
+        widths = widths or column_widths(frame, style)
+        if stream:
+            stream_grid(list(frame.columns), frame_rows(frame), widths, out, pagesize, margins, style, head)
+        else:
+            canv = TimedCanvas(out, pagesize=pagesize)
+            draw_grid(canv, list(frame.columns), frame_rows(frame), widths, pagesize, margins, style, head)
+            canv.save()
+        s["rows"], s["bytes"] = len(frame), out.tell()
+    return out.getvalue() if sink is None else sink
+
+
+# Streaming mode: rows are pulled from any iterable (e.g. frame_rows or a
+# generator over chunks) and each page is written to `sink` as soon as it is
+# laid out, so peak memory is one page of rows regardless of report size.
+# Column widths must be known up front (column_widths, or fixed widths).
+def stream_grid(header, rows, widths, sink, pagesize=A4, margins=(inch,) * 4, style=GRID_STYLE, head=()):
+    with PDFStreamWriter(sink, pagesize) as pdf:
+        fonts = {name: pdf.font(name) for name in (style.header_font, style.font)}
+        for ops in grid_pages(header, rows, widths, fonts, pagesize, margins, style, head):
+            pdf.page(ops)
+    return sink
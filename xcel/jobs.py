@@ -0,0 +1,116 @@
+import functools
+import os
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+
+from xcel import timing
+from xcel.cache import RENDER_CACHE
+from xcel.model import proforma_key
+
+
+# --- PDF renders off the Streamlit script thread ---
+# Each render runs on a small shared thread pool and is tracked by a
+# RenderJob that the app keeps in st.session_state. Progress comes from
+# ReportLab's progress callback (pages drawn, share of item rows placed),
+# and cancelling makes that callback raise, so the build stops at the next
+# page. Submitting the same key while a job for it is still running
+# (a double click, or two sessions generating the same PI) returns the
+# running job instead of starting a second render.
+class RenderCancelled(Exception):
+    pass
+
+
+class RenderJob:
+    def __init__(self, key):
+        self.key = key
+        self.pages = 0
+        self.fraction = 0.0
+        self.future = None
+        self._waiters = 1
+        self._cancel = threading.Event()
+
+    # ReportLab progress callback: progress(kind, value)
+    def progress(self, kind, value):
+        if self._cancel.is_set():
+            raise RenderCancelled(self.key)
+        if kind == "PAGE":
+            self.pages = value
+        elif kind == "ROWS":
+            self.fraction = value
+        elif kind == "FINISHED":
+            self.fraction = 1.0
+
+    # a coalesced job only stops once everyone waiting on it has cancelled
+    def cancel(self):
+        with _lock:
+            self._waiters -= 1
+            if self._waiters > 0:
+                return False
+            self._cancel.set()
+        self.future.cancel()
+        return True
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def done(self):
+        return self.future.done()
+
+    def error(self):
+        if not self.done() or self.future.cancelled():
+            return None
+        e = self.future.exception()
+        return None if isinstance(e, RenderCancelled) else e
+
+    def result(self):
+        try:
+            return self.future.result()
+        except (CancelledError, RenderCancelled):
+            return None
+
+
+_pool = ThreadPoolExecutor(max_workers=int(os.environ.get("XCEL_RENDER_WORKERS", "2")),
+                           thread_name_prefix="xcel-render")
+_jobs = {}
+_lock = threading.Lock()
+
+
+def _forget(job):
+    with _lock:
+        if _jobs.get(job.key) is job:
+            del _jobs[job.key]
+
+
+# each render is its own timing request (worker threads don't see the caller's)
+def _timed(key, fn, /, *args, **kwargs):
+    with timing.request("render", key=key):
+        return fn(*args, **kwargs)
+
+
+# fn(*args, progress=job.progress, **kwargs) runs on the pool
+def submit(key, fn, *args, **kwargs):
+    with _lock:
+        job = _jobs.get(key)
+        if job is not None and not job.cancelled:
+            job._waiters += 1
+            return job
+        job = _jobs[key] = RenderJob(key)
+        job.future = _pool.submit(_timed, key, fn, *args, progress=job.progress, **kwargs)
+    job.future.add_done_callback(lambda _: _forget(job))
+    return job
+
+
+# a PDF rendered before from the same invoice model comes back as a finished job
+def submit_proforma(order, fields, theme="master"):
+    from xcel.proforma import render_proforma_cached
+
+    key = proforma_key(order, fields, theme)
+    pdf = RENDER_CACHE.get(key)
+    if pdf is not None:
+        job = RenderJob(key)
+        job.future = Future()
+        job.future.set_result(pdf)
+        job.fraction = 1.0
+        return job
+    return submit(key, functools.partial(render_proforma_cached, key=key), order, fields, theme=theme)
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from xcel.timing import stage
+
+# label text (normalized) -> how many cells to the right the value sits
+ORDER_LABELS = {
+    "order_no": ("order no :", 2),
+    "brand": ("brand :", 1),
+    "made_in": ("made in country :", 1),
+    "loading_port": ("loading port :", 1),
+    "ship_date": ("agreed ship date :", 2),
+    "order_of": ("order of", 1),
+    "texture": ("texture :", 1),
+}
+
+
+def normalize(value, casefold=True):
+    text = str(value).strip()
+    return text.lower() if casefold else text
+
+
+# --- Every cell of the raw grid, normalized once, keyed by its text ---
+# casefold=False keeps the case, for exact lookups such as style numbers.
+class LabelIndex:
+    def __init__(self, raw_df, casefold=True):
+        with stage("label_index") as s:
+            self._index(raw_df, casefold)
+            s["cells"] = self.values.size
+
+    def _index(self, raw_df, casefold):
+        self.casefold = casefold
+        self.values = raw_df.to_numpy(dtype=object)
+        self.n_rows, self.n_cols = self.values.shape
+
+        flat = self.values.ravel()
+        present = np.flatnonzero(~pd.isna(flat))
+        text = np.char.strip(flat[present].astype(str))
+        if casefold:
+            text = np.char.lower(text)
+
+        # group cell positions by text, keeping row-major order inside each group
+        codes, uniques = pd.factorize(text)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.cumsum(np.bincount(codes, minlength=len(uniques)))[:-1]
+        self._cells = dict(zip(uniques, np.split(present[order], bounds)))
+
+    def __contains__(self, label):
+        return normalize(label, self.casefold) in self._cells
+
+    def cells(self, label):
+        positions = self._cells.get(normalize(label, self.casefold), ())
+        return [divmod(int(p), self.n_cols) for p in positions]
+
+    def find(self, label):
+        cells = self.cells(label)
+        return cells[0] if cells else None
+
+    def row_of(self, label):
+        cell = self.find(label)
+        return cell[0] if cell else None
+
+    def cell(self, label, offset=0, occurrence=-1):
+        # cell of the label that still has a cell `offset` to its right; by default
+        # the last occurrence wins, like the old full-sheet scans that kept overwriting
+        cells = [(i, j) for i, j in self.cells(label) if 0 <= j + offset < self.n_cols]
+        return cells[occurrence] if cells else None
+
+    def at(self, i, j):
+        if 0 <= i < self.n_rows and 0 <= j < self.n_cols:
+            return self.values[i, j]
+        return None
+
+    def value(self, label, offset=1, occurrence=-1):
+        cell = self.cell(label, offset, occurrence)
+        return None if cell is None else self.values[cell[0], cell[1] + offset]
+
+    def extract(self, spec):
+        return {name: self.value(label, offset) for name, (label, offset) in spec.items()}
@@ -0,0 +1,245 @@
+import io
+import re
+from bisect import bisect_right
+from itertools import accumulate
+
+from reportlab.lib import colors
+from reportlab.pdfbase import pdfdoc
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate
+from reportlab.platypus.flowables import Flowable
+
+from xcel.assets import image_by_name
+
+
+# --- Page template: one padding-free frame, outer border drawn per page ---
+# Replaces the old single-cell outer Table, which ReportLab cannot split.
+class InvoiceDocTemplate(BaseDocTemplate):
+    def __init__(self, filename, box=None, inset=(0, 0, 0, 0), border=(0.75, colors.black), background=None, **kw):
+        super().__init__(filename, **kw)
+        if box is None:
+            box = (self.leftMargin, self.bottomMargin, self.width, self.height)
+        self.box, self.border, self.background = box, border, background
+        x, y, w, h = box
+        left, right, top, bottom = inset
+        frame = Frame(x + left, y + bottom, w - left - right, h - top - bottom,
+                      leftPadding=0, rightPadding=0, topPadding=0, bottomPadding=0, id="invoice")
+        self.addPageTemplates([PageTemplate(id="invoice", frames=[frame], onPage=self.decorate)])
+
+    def decorate(self, canv, doc):
+        x, y, w, h = self.box
+        line_width, line_color = self.border
+        canv.saveState()
+        if self.background is not None:
+            canv.setFillColor(self.background)
+        canv.setStrokeColor(line_color)
+        canv.setLineWidth(line_width)
+        canv.rect(x, y, w, h, stroke=1, fill=self.background is not None)
+        canv.restoreState()
+
+    # CarryForwardTable pages carry the share of item rows placed so far;
+    # report it to the progress callback as ("ROWS", fraction)
+    def afterFlowable(self, flowable):
+        progress = getattr(flowable, "progress", None)
+        if progress is not None and self._onProgress:
+            self._onProgress("ROWS", progress)
+
+
+# --- Items table that paginates itself ---
+# Every page gets the `head` flowables (master header), the column header, a
+# "brought forward" row after the first page and a "carried forward" row
+# before each page break; the last page ends with the TOTAL row.
+#
+# Body rows have fixed heights, so finding the page break is a bisect over
+# precomputed prefix sums and each page only builds a Table for its own rows:
+# layout time is linear in the number of rows.
+#
+# make_chunk(rows, row_heights, brought, carried, final) -> Table, where
+# brought/carried are (qty, amount) subtotals (brought is None on page one).
+# chrome_height(brought, final) -> height of header + forward/total rows.
+class CarryForwardTable(Flowable):
+    def __init__(self, head, rows, row_heights, subtotals, make_chunk, chrome_height,
+                 start=0, brought=None, _sums=None):
+        super().__init__()
+        self.head, self.rows, self.row_heights = head, rows, row_heights
+        self.subtotals, self.make_chunk, self.chrome_height = subtotals, make_chunk, chrome_height
+        self.start, self.brought = start, brought
+        if _sums is None:
+            heights = list(accumulate(row_heights, initial=0))
+            qty = list(accumulate((s[0] for s in subtotals), initial=0))
+            amount = list(accumulate((s[1] for s in subtotals), initial=0.0))
+            _sums = (heights, qty, amount)
+        self._sums = _sums
+        self._parts = []
+
+    def _height(self, end):
+        heights = self._sums[0]
+        return heights[end] - heights[self.start]
+
+    def _carried(self, end):
+        _, qty, amount = self._sums
+        bq, ba = self.brought or (0, 0.0)
+        return (bq + qty[end] - qty[self.start], ba + amount[end] - amount[self.start])
+
+    def _head_height(self, availWidth):
+        return sum(f.wrap(availWidth, 1e9)[1] for f in self.head)
+
+    def _chunk(self, end, final):
+        start = self.start
+        return self.make_chunk(self.rows[start:end], self.row_heights[start:end],
+                               self.brought, self._carried(end), final)
+
+    def wrap(self, availWidth, availHeight):
+        end = len(self.rows)
+        self.width = availWidth
+        self.height = (self._head_height(availWidth) + self.chrome_height(self.brought, True)
+                       + self._height(end))
+        self._parts = []
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        remaining = len(self.rows) - self.start
+        room = availHeight - self._head_height(availWidth) - self.chrome_height(self.brought, False)
+        if room <= 0:
+            return []
+
+        heights = self._sums[0]
+        end = bisect_right(heights, heights[self.start] + room) - 1
+        # keep at least one row for the page that carries the TOTAL
+        end = min(end, self.start + remaining - 1) if remaining > 1 else end
+        if end <= self.start:
+            return []
+
+        rest = CarryForwardTable(self.head, self.rows, self.row_heights, self.subtotals,
+                                 self.make_chunk, self.chrome_height,
+                                 start=end, brought=self._carried(end), _sums=self._sums)
+        chunk = self._chunk(end, False)
+        chunk.progress = end / len(self.rows)
+        return [*self.head, chunk, rest]
+
+    def draw(self):
+        if not self._parts:
+            self._parts = [*self.head, self._chunk(len(self.rows), True)]
+        y = self.height
+        for f in self._parts:
+            _, h = f.wrap(self.width, y)
+            y -= h
+            f.drawOn(self.canv, 0, y)
+
+
+# --- Flowables drawn top-down as one unsplittable block ---
+class Stack(Flowable):
+    def __init__(self, flowables, hAlign="CENTER"):
+        super().__init__()
+        self.flowables, self.hAlign = flowables, hAlign
+
+    def wrap(self, availWidth, availHeight):
+        sizes = [f.wrap(availWidth, availHeight) for f in self.flowables]
+        self.width = max((w for w, _ in sizes), default=0)
+        self.height = sum(h for _, h in sizes)
+        return self.width, self.height
+
+    def draw(self):
+        y = self.height
+        for f in self.flowables:
+            _, h = f.wrap(self.width, y)
+            y -= h
+            f.drawOn(self.canv, 0, y)
+
+
+# --- Static chrome as a PDF form XObject ---
+# The static part of a layout is laid out once per process with Slot
+# placeholders where the per-invoice text goes. Its content stream is
+# captured from a scratch canvas and installed into each document as a form
+# XObject; pages reference it with a single `Do`, and only the slot contents
+# go through platypus per invoice.
+#
+# Form XObjects belong to one PDF, so what is shared across documents is the
+# captured stream: font resource names (/F1, /F2, ...) are assigned per
+# document and get remapped on install, and images drawn through AssetImage
+# are registered by their content digest.
+class Slot(Flowable):
+    def __init__(self, key, height):
+        super().__init__()
+        self.key, self.height = key, height
+        self.rect = None
+
+    def wrap(self, availWidth, availHeight):
+        self.width = availWidth
+        return self.width, self.height
+
+    def draw(self):
+        x, y = self.canv.absolutePosition(0, 0)
+        self.rect = (x, y, self.width, self.height)
+
+
+_FONT_REF = re.compile(r"/F\d+\b")
+
+
+class StaticChrome:
+    def __init__(self, name, skeleton, width, pagesize):
+        canv = Canvas(io.BytesIO(), pagesize=pagesize)
+        self.width, self.height = skeleton.wrapOn(canv, width, pagesize[1])
+        self.name = name
+        canv.beginForm(name, 0, 0, self.width, self.height)
+        skeleton.drawOn(canv, 0, 0)
+        self.stream = "\n".join([canv._preamble] + canv._code)
+        self.fonts = {internal: ps for ps, internal in canv._doc.fontMapping.items()}
+        self.images = [image_by_name(n) for n in dict.fromkeys(canv._formsinuse)]
+        canv.endForm()
+        self.slots = {s.key: s.rect for s in _slots(skeleton)}
+
+    # built from the images currently on disk (a replaced logo / signature makes it stale)
+    def current(self):
+        return all(asset.current() for asset in self.images)
+
+    # whether every flowable of `fill` fits its slot at its own size
+    def fits(self, fill):
+        for key, f in fill.items():
+            _, _, w, h = self.slots[key]
+            if f.wrap(w, h)[1] > h + 1e-6:
+                return False
+        return True
+
+    def install(self, canv):
+        doc = canv._doc
+        if doc.hasForm(self.name):
+            return
+        fonts = {internal: doc.getInternalFontName(ps) for internal, ps in self.fonts.items()}
+        for asset in self.images:
+            asset.register(canv)
+        form = pdfdoc.PDFFormXObject(0, 0, self.width, self.height)
+        form.compression = canv._pageCompression
+        form.setStreamList(_FONT_REF.sub(lambda m: fonts[m.group(0)], self.stream))
+        form.XObjects = doc.xobjDict([a.name for a in self.images]) if self.images else None
+        doc.addForm(self.name, form)
+
+
+def _slots(flowable):
+    if isinstance(flowable, Slot):
+        yield flowable
+    for row in getattr(flowable, "_cellvalues", ()):
+        for cell in row:
+            for f in (cell if isinstance(cell, (list, tuple)) else [cell]):
+                yield from _slots(f)
+    for f in getattr(flowable, "flowables", ()):
+        yield from _slots(f)
+
+
+# `fill` must fit the slots (StaticChrome.fits): the text is drawn as is, never shrunk.
+class ChromeFlowable(Flowable):
+    def __init__(self, chrome, fill=None, hAlign="CENTER"):
+        super().__init__()
+        self.chrome, self.fill, self.hAlign = chrome, fill or {}, hAlign
+
+    def wrap(self, availWidth, availHeight):
+        return self.chrome.width, self.chrome.height
+
+    def draw(self):
+        canv, chrome = self.canv, self.chrome
+        chrome.install(canv)
+        canv.doForm(chrome.name)
+        for key, f in self.fill.items():
+            x, y, w, h = chrome.slots[key]
+            _, fh = f.wrapOn(canv, w, h)
+            f.drawOn(canv, x, y + h - fh)
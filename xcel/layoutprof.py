@@ -0,0 +1,129 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from reportlab.platypus.flowables import Flowable
+
+
+# --- Layout profiler: where platypus spends its time ---
+# While profile() is active, wrap / split / draw of every Flowable class is
+# counted and timed per (section, flowable class, call). Sections are the
+# logical blocks of a layout (master header, bank block, items table, ...),
+# tagged on the flowable with section(); untagged flowables belong to the
+# nearest tagged one they are nested in, and pieces returned by split()
+# inherit the section of the flowable that was split.
+#
+# Times are inclusive ("total") and exclusive ("self": minus nested calls).
+# folded() gives the call tree in the folded-stack format of flamegraph.pl /
+# speedscope, in microseconds of self time:
+#     items table;CarryForwardTable.split;master header;Table.wrap;Paragraph.wrap 1234
+#
+# Profiling patches the Flowable classes process-wide: use it from a script
+# or the CLI, one render at a time, not inside a running server.
+
+OPS = ("wrap", "split", "draw")
+_active = None
+_lock = threading.Lock()
+
+
+def section(name, flowable):
+    flowable._xcel_section = name
+    return flowable
+
+
+class LayoutProfile:
+    def __init__(self):
+        self.calls = {}   # (section, class, op) -> [calls, total_s, self_s]
+        self.stacks = {}  # folded stack -> self_s
+        self._frames = []  # [flowable, op, section, path, nested_s]
+
+    def _call(self, flowable, op, fn, args, kwargs):
+        frames = self._frames
+        if frames and frames[-1][0] is flowable and frames[-1][1] == op:
+            return fn(flowable, *args, **kwargs)  # super().wrap(...) of the same call
+
+        parent = frames[-1] if frames else None
+        tag = getattr(flowable, "_xcel_section", None)
+        sect = tag or (parent[2] if parent else "(untagged)")
+        path = parent[3] if parent else ()
+        if tag and tag != (parent[2] if parent else None):
+            path += (tag,)
+        path += (f"{type(flowable).__name__}.{op}",)
+
+        frame = [flowable, op, sect, path, 0.0]
+        frames.append(frame)
+        started = time.perf_counter()
+        try:
+            result = fn(flowable, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            frames.pop()
+            if frames:
+                frames[-1][4] += elapsed
+            own = elapsed - frame[4]
+            rec = self.calls.setdefault((sect, type(flowable).__name__, op), [0, 0.0, 0.0])
+            rec[0] += 1
+            rec[1] += elapsed
+            rec[2] += own
+            self.stacks[path] = self.stacks.get(path, 0.0) + own
+        if op == "split":
+            for piece in result or ():
+                if getattr(piece, "_xcel_section", None) is None:
+                    piece._xcel_section = sect
+        return result
+
+    # rows sorted by self time: section, flowable, op, calls, total_ms, self_ms
+    def table(self):
+        rows = [{"section": s, "flowable": cls, "op": op, "calls": n,
+                 "total_ms": round(total * 1000, 2), "self_ms": round(own * 1000, 2)}
+                for (s, cls, op), (n, total, own) in self.calls.items()]
+        return sorted(rows, key=lambda r: r["self_ms"], reverse=True)
+
+    # self time per section, ms
+    def sections(self):
+        out = {}
+        for (s, _, _), (_, _, own) in self.calls.items():
+            out[s] = out.get(s, 0.0) + own * 1000
+        return dict(sorted(out.items(), key=lambda kv: kv[1], reverse=True))
+
+    def folded(self):
+        return "\n".join(f"{';'.join(path)} {round(own * 1e6)}"
+                         for path, own in sorted(self.stacks.items()) if own > 0) + "\n"
+
+
+def _traced(op, fn):
+    def traced(self, *args, **kwargs):
+        prof = _active
+        if prof is None or threading.get_ident() != prof._thread:
+            return fn(self, *args, **kwargs)
+        return prof._call(self, op, fn, args, kwargs)
+    traced.__wrapped__ = fn
+    return traced
+
+
+def _flowable_classes(cls=Flowable):
+    yield cls
+    for sub in cls.__subclasses__():
+        yield from _flowable_classes(sub)
+
+
+@contextmanager
+def profile():
+    global _active
+    with _lock:
+        prof = LayoutProfile()
+        prof._thread = threading.get_ident()
+        patched = []
+        for cls in dict.fromkeys(_flowable_classes()):
+            for op in OPS:
+                fn = cls.__dict__.get(op)
+                if callable(fn):
+                    setattr(cls, op, _traced(op, fn))
+                    patched.append((cls, op, fn))
+        _active = prof
+        try:
+            yield prof
+        finally:
+            _active = None
+            for cls, op, fn in patched:
+                setattr(cls, op, fn)
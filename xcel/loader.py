@@ -0,0 +1,73 @@
+import os
+
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from xcel.timing import stage
+
+
+# --- Read the sheet once as a raw grid (no header) ---
+def read_grid(source, sheet_name=0):
+    with stage("read") as s:
+        raw_df = pd.read_excel(source, header=None, sheet_name=sheet_name)
+        s["bytes"] = _source_size(source)
+        s["rows"], s["cells"] = raw_df.shape[0], raw_df.size
+    return raw_df
+
+
+def _source_size(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    if hasattr(source, "getbuffer"):
+        return source.getbuffer().nbytes
+    return getattr(source, "size", 0) or 0
+
+
+def _header_cells(row):
+    # blank header cells must be "" (not NaN) so pandas names them "Unnamed: ..."
+    return ["" if pd.isna(v) else v for v in row]
+
+
+def _fill_mi_header(row, control_row):
+    # forward fill blanks inside the same parent header, like read_excel does
+    last = row[0]
+    for i in range(1, len(row)):
+        if not control_row[i]:
+            last = row[i]
+        if row[i] == "":
+            row[i] = last
+        else:
+            control_row[i] = False
+            last = row[i]
+    return row, control_row
+
+
+# --- Build the typed item frame from the grid already in memory ---
+# Same result as pd.read_excel(source, header=header) without parsing the file again.
+def frame_from_grid(raw_df, header=0):
+    with stage("header_detect") as s:
+        df = _frame_from_grid(raw_df, header)
+        s["rows"], s["cells"] = df.shape[0], df.size
+    return df
+
+
+def _frame_from_grid(raw_df, header):
+    data = raw_df.to_numpy(dtype=object).tolist()
+    if not data:
+        return pd.DataFrame()
+
+    if isinstance(header, (list, tuple)):
+        header = list(header)
+        if len(header) == 1:
+            header = header[0]
+
+    if isinstance(header, list):
+        control_row = [True] * len(data[0])
+        for r in header:
+            if r > len(data) - 1:
+                raise ValueError(f"header index {r} exceeds maximum index {len(data) - 1} of data.")
+            data[r], control_row = _fill_mi_header(_header_cells(data[r]), control_row)
+    else:
+        data[header] = _header_cells(data[header])
+
+    return TextParser(data, header=header, skip_blank_lines=False).read()
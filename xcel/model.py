@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import threading
+import weakref
+
+# invoice fields typed into the form; `order` is what xcel.pipeline.parse_proforma returns
+FIELD_DEFAULTS = {
+    "pi_no": "SAR/LG/XXXX",
+    "consignee_name": "RNA Resource Group Ltd - Landmark (Babyshop)",
+    "consignee_addr": "P.O Box 25030, Dubai, UAE",
+    "consignee_tel": "Tel: 00971 4 8095500, Fax: 00971 4 8095555/66",
+    "buyer_name": "LANDMARK GROUP",
+    "brand_name": "Juniors",
+    "payment_term": "T/T",
+}
+
+# bump when the rendered PDF changes for the same model (layout, themes, fonts),
+# so cached PDFs from older code are not served
+RENDER_VERSION = 1
+
+# brand images the proforma layouts embed
+ASSET_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOGO = os.path.join(ASSET_DIR, "sarlogo.jpg")
+SIGNATURE = os.path.join(ASSET_DIR, "sarsign.png")
+
+# the modules a proforma PDF's bytes depend on; their source is hashed into the
+# model too, so a layout change without a RENDER_VERSION bump still misses the cache
+RENDER_SOURCES = ("proforma.py", "layout.py", "theme.py", "assets.py", "render.py", "words.py")
+_code = None
+
+
+def code_digest():
+    global _code
+    if _code is None:
+        h = hashlib.sha256()
+        for name in RENDER_SOURCES:
+            with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), name), "rb") as f:
+                h.update(f.read())
+        _code = h.hexdigest()
+    return _code
+
+
+# (path, mtime_ns, size) of each brand image; a replaced file changes the model
+def asset_stamps(paths=(LOGO, SIGNATURE)):
+    stamps = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamps.append([os.path.basename(path), st.st_mtime_ns, st.st_size])
+        except OSError:
+            stamps.append([os.path.basename(path), None, None])
+    return stamps
+
+
+# Item rows enter the model as a digest of their values, computed once per
+# agg_df object: parsed orders are shared read-only (PARSE_CACHE, session
+# state), so a repeat request only hashes the header and form fields.
+_digests = {}
+_lock = threading.Lock()
+
+
+def items_digest(items):
+    key = id(items)
+    with _lock:
+        digest = _digests.get(key)
+    if digest is None:
+        data = json.dumps([[str(c) for c in items.columns], json.loads(items.to_json(orient="values", double_precision=10))],
+                          separators=(",", ":"), ensure_ascii=False)
+        digest = hashlib.sha256(data.encode("utf-8")).hexdigest()
+        with _lock:
+            _digests[key] = digest
+        weakref.finalize(items, _digests.pop, key, None)
+    return digest
+
+
+# --- Everything a proforma PDF is rendered from, as plain JSON-able data ---
+# PDFs are rendered with ReportLab's invariant mode (fixed creation date and
+# document ID), so the same model always gives the same bytes and the model
+# hash can key a cache of rendered PDFs.
+def invoice_model(order, fields, theme="master"):
+    return {
+        "version": RENDER_VERSION,
+        "code": code_digest(),
+        "assets": asset_stamps(),
+        "theme": theme if isinstance(theme, str) else theme.name,
+        "header": {k: str(v) for k, v in order.items() if k != "agg_df"},
+        "fields": {k: str(v) for k, v in {**FIELD_DEFAULTS, **fields}.items()},
+        "items": items_digest(order["agg_df"]),
+    }
+
+
+def model_hash(model):
+    data = json.dumps(model, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def proforma_key(order, fields, theme="master"):
+    return model_hash(invoice_model(order, fields, theme))
@@ -0,0 +1,91 @@
+import zlib
+
+from reportlab.lib.pagesizes import A4
+
+from xcel.timing import stage
+
+
+# --- Minimal page-at-a-time PDF writer ---
+# ReportLab's canvas keeps every page in its PDFDocument until save(). This
+# writer emits each page's content stream and page object to the sink as
+# soon as page() is called, so a report's memory use does not grow with its
+# length (only one offset per object and one object number per page are
+# kept). It understands just what the grid reports need: the standard
+# Type 1 fonts and a content stream of raw PDF operators.
+class PDFStreamWriter:
+    def __init__(self, sink, pagesize=A4, compress=True):
+        self.sink, self.pagesize, self.compress = sink, pagesize, compress
+        self.pos = 0
+        self.offsets = {}
+        self.kids = []
+        self.fonts = {}
+        self._next = 1
+        self.catalog, self.pages, self.resources = self._reserve(), self._reserve(), self._reserve()
+        self._write(b"%PDF-1.4\n%\x93\x8c\x8b\x9e\n")
+
+    def _reserve(self):
+        num, self._next = self._next, self._next + 1
+        return num
+
+    def _write(self, data):
+        self.sink.write(data)
+        self.pos += len(data)
+
+    def _object(self, num, body, stream=None):
+        self.offsets[num] = self.pos
+        if stream is None:
+            self._write(b"%d 0 obj\n%s\nendobj\n" % (num, body))
+        else:
+            self._write(b"%d 0 obj\n%s\nstream\n%s\nendstream\nendobj\n" % (num, body, stream))
+
+    # resource name (/F1, ...) for one of the 14 standard fonts
+    def font(self, name):
+        if name not in self.fonts:
+            self.fonts[name] = ("/F%d" % (len(self.fonts) + 1), self._reserve())
+        return self.fonts[name][0]
+
+    def page(self, ops):
+        with stage("pdf_write"):
+            self._page(ops)
+
+    def _page(self, ops):
+        data = ops.encode("latin-1")
+        if self.compress:
+            data, filters = zlib.compress(data), b" /Filter /FlateDecode"
+        else:
+            filters = b""
+        content = self._reserve()
+        self._object(content, b"<< /Length %d%s >>" % (len(data), filters), data)
+        page = self._reserve()
+        w, h = self.pagesize
+        self._object(page, b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %s %s] /Resources %d 0 R /Contents %d 0 R >>"
+                     % (self.pages, _num(w), _num(h), self.resources, content))
+        self.kids.append(page)
+
+    def close(self):
+        for name, (ref, num) in self.fonts.items():
+            self._object(num, b"<< /Type /Font /Subtype /Type1 /Name %s /BaseFont /%s /Encoding /WinAnsiEncoding >>"
+                         % (ref.encode(), name.encode()))
+        fonts = b" ".join(b"%s %d 0 R" % (ref.encode(), num) for ref, num in self.fonts.values())
+        self._object(self.resources, b"<< /Font << %s >> /ProcSet [/PDF /Text] >>" % fonts)
+        kids = b" ".join(b"%d 0 R" % k for k in self.kids)
+        self._object(self.pages, b"<< /Type /Pages /Count %d /Kids [%s] >>" % (len(self.kids), kids))
+        self._object(self.catalog, b"<< /Type /Catalog /Pages %d 0 R >>" % self.pages)
+
+        xref = self.pos
+        count = self._next
+        lines = [b"xref\n0 %d\n" % count, b"0000000000 65535 f \n"]
+        lines += [b"%010d 00000 n \n" % self.offsets[n] for n in range(1, count)]
+        self._write(b"".join(lines))
+        self._write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (count, self.catalog, xref))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+
+def _num(v):
+    return (b"%.4f" % v).rstrip(b"0").rstrip(b".")
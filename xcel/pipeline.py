@@ -0,0 +1,104 @@
+import io
+from datetime import datetime
+
+import pandas as pd
+
+from xcel.aggregate import aggregate_styles, to_proforma
+from xcel.cache import LAYOUT_CACHE, PARSE_CACHE, content_key
+from xcel.labels import LabelIndex, ORDER_LABELS
+from xcel.loader import read_grid, frame_from_grid
+from xcel.profiles import (DEFAULT_PROFILE, active_profiles, column_positions, header_names,
+                           label_texts, remember_layout, run_plans)
+
+# bump when parsing/aggregation output changes, so old on-disk cache entries are ignored
+PIPELINE_VERSION = 1
+
+
+class ParseError(ValueError):
+    pass
+
+
+# --- Style / Qty / Fob columns of the two-row proforma header ---
+# By default (xcel.profiles.DEFAULT_PROFILE): Style is the first header starting
+# with "style", Qty the column just left of the first "value" column, Fob the
+# first header containing "fob".
+def detect_proforma_columns(df, rules=None):
+    headers = list(df.columns)
+    found = column_positions(headers, rules or DEFAULT_PROFILE["columns"])
+    return tuple(None if found.get(role) is None else headers[found[role]] for role in ("style", "qty", "fob"))
+
+
+def _label_value(labels, spec):
+    offset = spec.get("offset", 1)
+    return next((v for v in (labels.value(t, offset) for t in label_texts(spec)) if v is not None), None)
+
+
+def _finish(order, agg):
+    order["country_of_origin"] = order["made_in"]
+    if isinstance(order["ship_date"], (datetime, pd.Timestamp)):
+        order["ship_date"] = order["ship_date"].strftime("%d/%m/%Y")
+    order["agg_df"] = to_proforma(agg, order["texture"], order["country_of_origin"])
+    return order
+
+
+# --- Item rows under the proforma header: (frame, header row, style / qty / fob columns) ---
+def proforma_items(raw_df, labels, profile=DEFAULT_PROFILE):
+    header = profile["header"]
+    header_row_idx = next((r for r in (labels.row_of(t) for t in label_texts(header)) if r is not None), None)
+    if header_row_idx is None:
+        raise ParseError("❌ Could not find 'Style' header.")
+
+    n = header.get("rows", 2)
+    df = frame_from_grid(raw_df, header=list(range(header_row_idx, header_row_idx + n)))
+    if n > 1:
+        df.columns = header_names(df.columns)
+    df = df.dropna(how="all")
+
+    style_col, qty_col, fob_col = detect_proforma_columns(df, profile["columns"])
+    if not style_col or not qty_col:
+        raise ParseError("❌ Could not detect Qty/Style column.")
+    return df, header_row_idx, (style_col, qty_col, fob_col)
+
+
+# --- Upload -> order header fields + agg_df (saram.py / neo.py) ---
+# `profile` (see xcel.profiles) sets the label vocabulary, the header label
+# and the column rules; the default is the Landmark-style sheet. With
+# `layouts` (xcel.cache.LAYOUT_CACHE) the detected layout is remembered.
+def parse_proforma(source, profile=None, layouts=None):
+    profile = profile or DEFAULT_PROFILE
+    raw_df = read_grid(source)
+    labels = LabelIndex(raw_df)
+
+    order = {name: _label_value(labels, spec) for name, spec in profile["labels"].items()}
+    df, header_row_idx, (style_col, qty_col, fob_col) = proforma_items(raw_df, labels, profile)
+
+    columns = profile["columns"]
+    agg = aggregate_styles(df, style_col, qty_col, fob_col,
+                           desc_pos=columns.get("description", {}).get("position", 1),
+                           comp_pos=columns.get("composition", {}).get("position", 2))
+    if layouts is not None:
+        remember_layout(layouts, labels, header_row_idx, column_positions(list(df.columns), columns), profile)
+    return _finish(order, agg)
+
+
+# --- Known template: read the cells a compiled profile names, no scanning ---
+# None when no plan's spot checks pass (the caller falls back to parse_proforma).
+def parse_planned(source, plans, layouts=None):
+    planned = run_plans(plans, source, layouts)
+    return None if planned is None else order_from_plan(*planned)
+
+
+def order_from_plan(plan, fields, items):
+    agg = aggregate_styles(items, "style", "qty", "fob" if "fob" in plan.columns else None)
+    return _finish(fields, agg)
+
+
+# Same as parse_proforma, cached by the upload's content hash across reruns and sessions.
+# Workbooks that match a profile in XCEL_PROFILE_DIR, or the remembered layout
+# of an earlier upload, are read by that plan.
+def load_proforma(data):
+    profiles, plans = active_profiles()
+    key = content_key(data, parser="proforma", labels=ORDER_LABELS, profiles=profiles, version=PIPELINE_VERSION)
+    return PARSE_CACHE.get_or_compute(
+        key, lambda: parse_planned(io.BytesIO(data), plans, LAYOUT_CACHE)
+        or parse_proforma(io.BytesIO(data), layouts=LAYOUT_CACHE))
@@ -0,0 +1,379 @@
+import hashlib
+import json
+import os
+from itertools import chain, islice
+
+from openpyxl.cell.cell import ERROR_CODES
+from openpyxl.utils.cell import column_index_from_string, coordinate_from_string, get_column_letter
+from pandas.io.parsers import TextParser
+
+from xcel.labels import ORDER_LABELS, normalize
+from xcel.loader import frame_from_grid
+from xcel.timing import current, stage
+
+
+# --- Extraction profiles: per-buyer layout as data ---
+# A profile lists the label vocabulary (label text, value offset), the header
+# rule and the column roles of one buyer's order sheet:
+#
+#   {"name": "landmark", "sheet": 0,
+#    "match": {"A1": "landmark group"},
+#    "labels": {"order_no": {"label": "order no :", "offset": 2, "cell": "A2"}, ...},
+#    "header": {"label": "style", "rows": 2, "row": 8},
+#    "columns": {"style": {"startswith": "style", "column": "A"},
+#                "qty": {"left_of": "value", "column": "J"},
+#                "fob": {"contains": "fob", "column": "L"},
+#                "description": {"position": 1, "column": "B"},
+#                "composition": {"position": 2, "column": "C"}}}
+#
+# Without addresses (cell / row / column) a profile only parametrizes the
+# heuristic parse (label scan, header search, column rules). With all of them
+# it compiles into a Plan: read only the cells it names, straight from the
+# sheet XML (openpyxl read-only), after spot-checking that the labels, match
+# cells and header cells are where the profile says. A workbook that fails a
+# check falls back to the heuristic parse.
+#
+# Rows are 1-based and columns are letters, as in Excel. A label whose "cell"
+# is null is absent from that template (its field is None).
+# Profiles are .json files (or .yaml / .yml with PyYAML installed) in
+# XCEL_PROFILE_DIR; `python -m xcel learn-profile order.xlsx` writes one.
+#
+# Without any profile files, layouts still get learned: after a heuristic
+# parse the detected addresses are kept (xcel.cache.LAYOUT_CACHE) under the
+# sheet's layout fingerprint, and the next workbook with that fingerprint is
+# read by the remembered plan, its spot checks standing in for detection.
+
+
+class ProfileError(ValueError):
+    pass
+
+
+# today's heuristics (labels.ORDER_LABELS, the "Style" header, pipeline's column rules)
+DEFAULT_PROFILE = {
+    "name": "default",
+    "sheet": 0,
+    "labels": {name: {"label": label, "offset": offset} for name, (label, offset) in ORDER_LABELS.items()},
+    "header": {"label": "style", "rows": 2},
+    "columns": {
+        "style": {"startswith": "style"},
+        "qty": {"left_of": "value"},
+        "fob": {"contains": "fob"},
+        "description": {"position": 1},
+        "composition": {"position": 2},
+    },
+}
+
+ROLES = ("style", "qty", "fob")
+# item columns a plan reads, in the order aggregate_styles expects (description at 1, composition at 2)
+ITEM_ROLES = ("style", "description", "composition", "qty", "fob")
+
+
+def label_texts(spec):
+    label = spec["label"]
+    return [normalize(t) for t in (label if isinstance(label, list) else [label])]
+
+
+# index of the first header that satisfies a column rule (address keys are ignored)
+def find_column(headers, rule):
+    names = [str(h).strip().lower() for h in headers]
+    if "startswith" in rule:
+        return next((i for i, n in enumerate(names) if n.startswith(rule["startswith"])), None)
+    if "contains" in rule:
+        return next((i for i, n in enumerate(names) if rule["contains"] in n), None)
+    if "left_of" in rule:
+        i = next((i for i, n in enumerate(names) if rule["left_of"] in n), None)
+        return i - 1 if i else None
+    if "position" in rule:
+        return rule["position"] if rule["position"] < len(names) else None
+    return None
+
+
+def _address(cell):
+    letters, row = coordinate_from_string(cell)
+    return row - 1, column_index_from_string(letters) - 1
+
+
+def _read_file(path):
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml  # optional: only needed for YAML profiles
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def load_profile(path):
+    profile = _read_file(path)
+    profile.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    return profile
+
+
+def load_profiles(directory):
+    if not directory or not os.path.isdir(directory):
+        return []
+    names = sorted(n for n in os.listdir(directory) if n.endswith((".json", ".yaml", ".yml")))
+    return [load_profile(os.path.join(directory, n)) for n in names]
+
+
+_active = None
+
+
+# profiles from XCEL_PROFILE_DIR and their plans, loaded once per process
+def active_profiles():
+    global _active
+    if _active is None:
+        profiles = load_profiles(os.environ.get("XCEL_PROFILE_DIR"))
+        _active = (profiles, compile_profiles(profiles))
+    return _active
+
+
+# --- Compiled profile: the cells to read and the checks that make them valid ---
+class Plan:
+    def __init__(self, profile):
+        self.name = profile.get("name", "profile")
+        self.sheet = profile.get("sheet", 0)
+        header, columns = profile["header"], profile["columns"]
+        if "row" not in header or any("column" not in columns.get(r, {}) for r in ("style", "qty")):
+            raise ProfileError(f"profile {self.name!r} has no header row / style and qty columns to compile")
+
+        # [(row, col, accepted texts, how)]: how is "equals" or a column rule key
+        self.checks = [(*_address(cell), [normalize(text)], "equals") for cell, text in profile.get("match", {}).items()]
+        self.fields = {}
+        for name, spec in profile["labels"].items():
+            if "cell" not in spec:
+                raise ProfileError(f"profile {self.name!r}: label {name!r} has no cell to compile")
+            if spec["cell"] is None:
+                self.fields[name] = None
+                continue
+            r, c = _address(spec["cell"])
+            self.checks.append((r, c, label_texts(spec), "equals"))
+            self.fields[name] = (r, c + spec.get("offset", 1))
+
+        self.header_row = header["row"] - 1
+        self.header_rows = header.get("rows", 2)
+        self.columns = {role: column_index_from_string(rule["column"]) - 1
+                        for role, rule in columns.items() if "column" in rule}
+        for role in ROLES:
+            rule = columns.get(role, {})
+            for how in ("startswith", "contains", "left_of"):
+                if how in rule and role in self.columns:
+                    col = self.columns[role] + (how == "left_of")
+                    self.checks.append((self.header_row, col, [rule[how]], how))
+
+        self.data_start = self.header_row + self.header_rows
+        cells = [(r, c) for r, c, _, _ in self.checks] + [f for f in self.fields.values() if f]
+        if any(r >= self.data_start for r, _ in cells):
+            raise ProfileError(f"profile {self.name!r}: label cells must sit above the item rows")
+        # the columns a plan reads: label values and item roles
+        self.read_cols = sorted({c for _, c in filter(None, self.fields.values())} | set(self.columns.values()))
+
+    def matches(self, head):
+        for r, c, texts, how in self.checks:
+            text = _header_text(head, r, c, self.header_rows) if how != "equals" else _text(head, r, c)
+            if how == "equals" and text not in texts:
+                return False
+            if how == "startswith" and not text.startswith(texts[0]):
+                return False
+            if how in ("contains", "left_of") and texts[0] not in text:
+                return False
+        return True
+
+    # header fields + a frame of the item rows' ITEM_ROLES columns, from all rows of
+    # the sheet. Only read_cols are typed, but each the way the heuristic parse
+    # types it: read_excel infers a dtype per column of the whole sheet, then
+    # frame_from_grid infers one again for the rows under the header.
+    def extract(self, rows):
+        rows = _trim(rows)
+        cols = self.read_cols
+        grid = TextParser([[_convert(row[c]) if c < len(row) else "" for c in cols] for row in rows],
+                          header=None).read()
+        values = grid.to_numpy(dtype=object)  # as LabelIndex sees the grid
+        fields = {name: None if at is None or at[0] >= len(values) else values[at[0], cols.index(at[1])]
+                  for name, at in self.fields.items()}
+        frame = frame_from_grid(grid, header=list(range(self.header_row, self.data_start)))
+        roles = [r for r in ITEM_ROLES if r in self.columns]
+        items = frame.iloc[:, [cols.index(self.columns[r]) for r in roles]].set_axis(roles, axis=1)
+        return fields, items.reindex(columns=list(ITEM_ROLES))
+
+
+def _cell(rows, r, c):
+    if r < len(rows) and c < len(rows[r]):
+        return rows[r][c]
+    return None
+
+
+def _text(rows, r, c):
+    value = _cell(rows, r, c)
+    return "" if value is None else normalize(value)
+
+
+# the header name pandas builds from the header rows (blank cells left out)
+def _header_text(rows, r, c, n):
+    return " ".join(t for t in (_text(rows, r + k, c) for k in range(n)) if t)
+
+
+# a cell value as read_excel's openpyxl reader converts it: blanks "", errors
+# NaN, numbers equal to an int become that int (the column dtype is inferred later)
+def _convert(value):
+    if value is None:
+        return ""
+    if isinstance(value, str) and value in ERROR_CODES:
+        return float("nan")
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+# read_excel drops the empty rows at the end of the sheet
+def _trim(rows):
+    end = len(rows)
+    while end and all(v is None for v in rows[end - 1]):
+        end -= 1
+    return rows[:end]
+
+
+def compile_profile(profile):
+    return Plan(profile)
+
+
+def compile_profiles(profiles):
+    plans = []
+    for profile in profiles:
+        try:
+            plans.append(Plan(profile))
+        except ProfileError:
+            pass  # heuristic-only profile
+    return plans
+
+
+# --- Layout fingerprint: what stays the same across one buyer's order sheets ---
+# From the first FINGERPRINT_ROWS rows: the A1 text, where each order label
+# sits, and the text and width of the header rows. Order values (numbers,
+# dates, names) are left out, so every order of one template shares it.
+# None when the header is not within those rows.
+FINGERPRINT_ROWS = 50
+
+
+def fingerprint(rows, profile=DEFAULT_PROFILE):
+    rows = [list(row) for row in islice(rows, FINGERPRINT_ROWS)]
+    cells = {(r, c): normalize(v) for r, row in enumerate(rows) for c, v in enumerate(row) if isinstance(v, str)}
+    first = {}
+    for at, text in sorted(cells.items()):
+        first.setdefault(text, at)
+    header_row = next((first[t][0] for t in label_texts(profile["header"]) if t in first), None)
+    n = profile["header"].get("rows", 2)
+    if header_row is None or header_row + n > len(rows):
+        return None
+
+    vocabulary = {t for spec in profile["labels"].values() for t in label_texts(spec)}
+    width = max((c + 1 for (r, c), t in cells.items() if header_row <= r < header_row + n and t), default=0)
+    header = [[cells.get((header_row + k, c), "") for c in range(width)] for k in range(n)]
+    marks = {
+        "a1": cells.get((0, 0)),
+        "labels": sorted((r, c, t) for (r, c), t in cells.items() if t in vocabulary and r < header_row),
+        "header": [header_row, width, header],
+    }
+    return hashlib.sha256(json.dumps(marks, default=str).encode("utf-8")).hexdigest()
+
+
+# --- Run the first plan whose checks pass; None if none does ---
+# One streaming pass over the sheet: the rows above the item table are read
+# for every plan's checks, then the rest for the matching plan's columns.
+# With `layouts` (a cache of addressed profiles by fingerprint), a workbook no
+# plan matches is tried with the layout remembered for its fingerprint.
+def run_plans(plans, source, layouts=None):
+    from openpyxl import load_workbook
+
+    plans = [p for p in plans if p.sheet == 0]  # the heuristic parse reads the first sheet too
+    if not plans and layouts is None:
+        return None
+    with stage("read") as s:
+        wb = load_workbook(source, read_only=True, data_only=True)
+        try:
+            ws = wb.worksheets[0]
+            ws.reset_dimensions()  # like read_excel: rows as long as their last cell
+            rows = ws.iter_rows(values_only=True)
+            depth = [p.data_start for p in plans] + ([FINGERPRINT_ROWS] if layouts is not None else [])
+            head = list(islice(rows, max(depth)))
+            plan = next((p for p in plans if p.matches(head)), None)
+            if plan is None and layouts is not None:
+                plan = _remembered(layouts, head)
+            if plan is None:
+                return None
+            fields, items = plan.extract(list(chain(head, rows)))
+        finally:
+            wb.close()
+        s["rows"], s["cells"] = len(items), items.size
+    request = current()
+    if request is not None:
+        request.context["profile"] = plan.name
+    return plan, fields, items
+
+
+def _remembered(layouts, head):
+    key = fingerprint(head)
+    profile = layouts.get(key) if key else None
+    if profile is None:
+        return None
+    plan = Plan(profile)
+    return plan if plan.data_start <= len(head) and plan.matches(head) else None
+
+
+# Keep the layout a heuristic parse detected, for the next workbook with its fingerprint.
+def remember_layout(layouts, labels, header_row, columns, base=DEFAULT_PROFILE):
+    key = fingerprint(labels.values, base)
+    if key is None:
+        return None
+    profile = address_profile(base, f"learned-{key[:8]}", labels, header_row, columns)
+    try:
+        Plan(profile)
+    except ProfileError:
+        return None  # e.g. a label only found below the header: not a fixed layout
+    layouts.put(key, profile)
+    return key
+
+
+# --- base + the addresses the heuristics found: label cells, header row, column indices ---
+def address_profile(base, name, labels, header_row, columns):
+    profile = json.loads(json.dumps(base))
+    profile["name"] = name
+    for spec in profile["labels"].values():
+        cell = next((c for c in (labels.cell(t, spec.get("offset", 1)) for t in label_texts(spec)) if c), None)
+        spec["cell"] = None if cell is None else f"{get_column_letter(cell[1] + 1)}{cell[0] + 1}"
+    profile["header"]["row"] = header_row + 1
+    for role, i in columns.items():
+        if i is not None and role in profile["columns"]:
+            profile["columns"][role]["column"] = get_column_letter(i + 1)
+    buyer = labels.at(0, 0)
+    if isinstance(buyer, str) and buyer.strip():
+        profile["match"] = {"A1": normalize(buyer)}
+    return profile
+
+
+# --- Fill a profile's addresses in from a sample workbook, using the heuristics ---
+def learn_profile(source, name, base=DEFAULT_PROFILE):
+    from xcel.labels import LabelIndex
+    from xcel.loader import frame_from_grid, read_grid
+
+    raw_df = read_grid(source)
+    labels = LabelIndex(raw_df)
+    header = base["header"]
+    row = next((r for r in (labels.row_of(t) for t in label_texts(header)) if r is not None), None)
+    if row is None:
+        raise ProfileError(f"no {header['label']!r} header in the sample workbook")
+    df = frame_from_grid(raw_df, header=list(range(row, row + header.get("rows", 2))))
+    columns = column_positions(header_names(df.columns), base["columns"])
+    for role in ("style", "qty"):
+        if columns.get(role) is None:
+            raise ProfileError(f"no {role} column in the sample workbook")
+    return address_profile(base, name, labels, row, columns)
+
+
+# pandas' header names, the rows of a multi-row header joined (blank cells left out)
+def header_names(columns):
+    return [" ".join(str(x) for x in col if str(x) != "nan").strip() if isinstance(col, tuple) else col
+            for col in columns.values]
+
+
+# column index per role, by the profile's column rules
+def column_positions(headers, rules):
+    return {role: find_column(headers, rule) for role, rule in rules.items()}
@@ -0,0 +1,425 @@
+import os
+import threading
+
+from reportlab.platypus import Table, TableStyle, Paragraph, Spacer
+from reportlab.lib import colors
+
+from xcel.assets import AssetImage
+from xcel.cache import RENDER_CACHE
+from xcel.layout import CarryForwardTable, ChromeFlowable, InvoiceDocTemplate, Slot, Stack, StaticChrome
+from xcel.layoutprof import section
+from xcel.model import FIELD_DEFAULTS, LOGO, SIGNATURE, proforma_key
+from xcel.render import render_pdf
+from xcel.theme import THEMES
+from xcel.words import amount_to_words
+
+# the outer border used to be a one-column Table with a 3pt cell padding above
+# and below each element; the page template draws the border now, so keep the gaps
+def _spaced(flowables, gap):
+    out = []
+    for f in flowables:
+        if out:
+            out.append(Spacer(1, gap))
+        out.append(f)
+    return out
+
+
+# ---------- "master" layout (saram.py) ----------
+# per-invoice text of the master header, keyed by the slot it fills
+def _master_fields(theme, order, fields):
+    S = theme.styles
+    return {
+        "pi_no": Paragraph(f"No. & date of PI: {fields['pi_no']}", S["right_top"]),
+        "order_ref": Paragraph(
+            f"<b>Landmark order Reference:</b> {order['order_no']}<br/>"
+            f"<b>Buyer Name:</b> {fields['buyer_name']}<br/>"
+            f"<b>Brand Name:</b> {fields['brand_name']}", S["right_block"]),
+        "consignee": Paragraph(f"<b>Consignee:</b><br/>{fields['consignee_name']}<br/>{fields['consignee_addr']}<br/>{fields['consignee_tel']}", S["row1_normal"]),
+        "payment_term": Paragraph(fields["payment_term"], S["value_small"]),
+        "shipment": Paragraph(f"<b>Loading Country:</b> {order['made_in'] or ''}<br/><b>Port of Loading:</b> {order['loading_port'] or ''}<br/><b>Agreed Shipment Date:</b> {order['ship_date'] or ''}", S["row1_normal"]),
+        "goods": Paragraph(f"<b>Description of goods:</b> {order['order_of'] or 'Value Packs'}", S["row1_normal"]),
+    }
+
+
+# (style, lines) reserved for each slot when the header is laid out as static chrome
+_MASTER_SLOTS = {
+    "pi_no": ("right_top", 1),
+    "order_ref": ("right_block", 3),
+    "consignee": ("row1_normal", 4),
+    "payment_term": ("value_small", 1),
+    "shipment": ("row1_normal", 3),
+    "goods": ("row1_normal", 1),
+}
+
+
+def _master_header(theme, dyn):
+    S, T, L = theme.styles, theme.tables, theme.layout
+    left_width, right_width = L["left_width"], L["right_width"]
+
+    # Build master header table (title row + 4 header blocks) in one two-column table
+    title_para = Paragraph("PROFORMA INVOICE", S["title"])
+
+    # Left header (supplier)
+    supplier_title = Table([
+        [Paragraph("Supplier Name:", S["supplier_label"])],
+        [Paragraph("SAR APPARELS INDIA PVT.LTD.", S["supplier_company"])]
+    ], colWidths=[left_width])
+    supplier_title.setStyle(T["supplier_title"])
+
+    supplier_contact = Table([
+        [Paragraph("Address:", S["supplier_small_label"]), Paragraph("6, Picaso Bithi, Kolkata - 700017", S["supplier_small_value"])],
+        [Paragraph("Phone:", S["supplier_small_label"]), Paragraph("9817473373", S["supplier_small_value"])],
+        [Paragraph("Fax:", S["supplier_small_label"]), Paragraph("N.A.", S["supplier_small_value"])]
+    ], colWidths=[left_width*0.30, left_width*0.70])
+    supplier_contact.setStyle(T["supplier_contact"])
+    supplier_stack = Table([[supplier_title],[supplier_contact]], colWidths=[left_width])
+    supplier_stack.setStyle(T["supplier_stack"])
+
+    # Right top (PI)
+    right_top = Table([[dyn["pi_no"]]], colWidths=[right_width])
+    right_top.setStyle(T["right_top"])
+
+    right_bottom = Table([[dyn["order_ref"]]], colWidths=[right_width])
+    right_bottom.setStyle(T["right_bottom"])
+    right_stack = Table([[right_top],[right_bottom]], colWidths=[right_width])
+    right_stack.setStyle(T["right_stack"])
+
+    # Consignee and payment blocks
+    consignee_box = Table([[dyn["consignee"]]], colWidths=[left_width])
+    consignee_box.setStyle(T["consignee_box"])
+
+    pay_term_tbl = Table([[Paragraph("Payment Term:", S["label_small"]), dyn["payment_term"]]],
+                         colWidths=[right_width*0.28, right_width*0.72])
+    pay_term_tbl.setStyle(T["pay_term"])
+    bank_heading_tbl = Table([[Paragraph("Bank Details (Including Swift/IBAN)", S["payment_header"])]], colWidths=[right_width])
+    bank_heading_tbl.setStyle(T["bank_heading"])
+
+    bank_rows = []
+    def add_bank_row(lbl, val):
+        bank_rows.append([Paragraph(lbl, S["label_small"]), "", Paragraph(":-", S["label_small"]), Paragraph(val, S["value_small"])])
+    add_bank_row("Beneficiary", "SAR APPARELS INDIA PVT.LTD")
+    add_bank_row("Account No", "2112819952")
+    add_bank_row("BANK'S NAME", "KOTAK MAHINDRA BANK LTD")
+    add_bank_row("BANK ADDRESS", "2 BRABOURNE ROAD, GOVIND BHAVAN, GROUND FLOOR, KOLKATA-700001")
+    add_bank_row("SWIFT CODE", "KKBKINBBCPC")
+    add_bank_row("BANK CODE", "0323")
+
+    bank_inner = Table(bank_rows, colWidths=list(L["bank_col_widths"]))
+    bank_inner.setStyle(T["bank_inner"])
+    payment_block = Table([[pay_term_tbl],[bank_heading_tbl],[bank_inner]], colWidths=[right_width])
+    payment_block.setStyle(T["payment_block"])
+    section("bank block", payment_block)
+
+    # Row 3
+    left_row3_box = Table([[dyn["shipment"]]], colWidths=[left_width])
+    left_row3_box.setStyle(T["text_box"])
+
+    # right row3: three breaks between lines
+    right_row3_box = Table([[Paragraph("<b>L/C Advising Bank:</b> (If applicable)<br/><br/><br/><b>Remarks:</b> (if any)", S["row1_normal"])]], colWidths=[right_width])
+    right_row3_box.setStyle(T["text_box"])
+
+    # Row 4
+    left_row4_box = Table([[dyn["goods"]]], colWidths=[left_width])
+    left_row4_box.setStyle(T["text_box"])
+
+    right_row4_box = Table([[Paragraph("CURRENCY: USD", S["row1_normal"])]], colWidths=[right_width], rowHeights=[L["row4_h"]])
+    right_row4_box.setStyle(T["currency_box"])
+
+    # title row spanned across both columns to keep centered, then header blocks
+    master_rows = [
+        [title_para, ""],
+        [supplier_stack, right_stack],
+        [consignee_box, payment_block],
+        [left_row3_box, right_row3_box],
+        [left_row4_box, right_row4_box],
+    ]
+    master_table = Table(master_rows, colWidths=[left_width, right_width],
+                         rowHeights=[L["title_row_h"], None, None, L["row3_h"], L["row4_h"]])
+    master_table.setStyle(T["master"])
+
+    return section("master header", master_table)
+
+
+def _master_tail(theme):
+    S, T, L = theme.styles, theme.tables, theme.layout
+    available_width = L["available_width"]
+
+    # Terms
+    terms_table = Table([[Paragraph("Terms & Conditions (if any):", S["terms_small"])]], colWidths=[available_width])
+    terms_table.setStyle(T["note_box"])
+
+    # Signature & footer
+    try:
+        sign_img = AssetImage(SIGNATURE, width=220, height=80)
+    except Exception:
+        sign_img = Paragraph("", S["normal"])
+    sign_row = Table([[sign_img, ""]], colWidths=[0.5*available_width, 0.5*available_width])
+    sign_row.setStyle(T["sign_row"])
+
+    left_footer = Paragraph("Signed by ……………………. (Affix Stamp here)", S["footer_left"])
+    right_footer = Paragraph("for RNA Resources Group Ltd-Landmark (Babyshop)", S["footer_right"])
+    footer_row = Table([[left_footer, right_footer]], colWidths=[0.5*available_width, 0.5*available_width])
+    footer_row.setStyle(T["footer_row"])
+    return [terms_table, sign_row, Spacer(1,8), footer_row]
+
+
+# static chrome (header and tail without per-invoice text), laid out once per
+# theme and again whenever an image it embeds changes on disk
+_CHROME = {}
+_chrome_lock = threading.Lock()
+
+
+def _master_chrome(theme, part):
+    key = (theme.name, part)
+    with _chrome_lock:
+        chrome = _CHROME.get(key)
+        if chrome is None or not chrome.current():
+            L = theme.layout
+            if part == "header":
+                slots = {k: Slot(k, lines * theme.styles[style].leading) for k, (style, lines) in _MASTER_SLOTS.items()}
+                skeleton = _master_header(theme, slots)
+            else:
+                skeleton = Stack(_spaced(_master_tail(theme), 6))
+            chrome = _CHROME[key] = StaticChrome(f"xcel_{theme.name}_{part}", skeleton,
+                                                 L["available_width"], L["pagesize"])
+        return chrome
+
+
+def _master_story(theme, order, fields, static_chrome=True):
+    S, T, L = theme.styles, theme.tables, theme.layout
+    agg_df = order["agg_df"]
+    available_width = L["available_width"]
+    col_widths = list(L["col_widths"])
+
+    elements = []
+    dyn = _master_fields(theme, order, fields)
+    # text longer than its slot (e.g. a 6-line consignee address) gets the platypus header instead
+    if static_chrome and _master_chrome(theme, "header").fits(dyn):
+        master_table = section("master header", ChromeFlowable(_master_chrome(theme, "header"), dyn))
+    else:
+        master_table = _master_header(theme, dyn)
+    tail = [ChromeFlowable(_master_chrome(theme, "tail"))] if static_chrome else _master_tail(theme)
+    tail = [section("footer", f) for f in tail]
+
+    # ---------- ITEMS TABLE ----------
+    header_labels = [
+        "STYLE NO.","ITEM DESCRIPTION",
+        "FABRIC TYPE<br/>KNITTED /<br/>WOVEN",
+        "H.S NO<br/>(8digit)",
+        "COMPOSITION OF<br/>MATERIAL",
+        "COUNTRY OF<br/>ORIGIN",
+        "QTY","UNIT PRICE<br/>FOB","AMOUNT"
+    ]
+    header_row = [Paragraph(lbl, S["tbl_header"]) for lbl in header_labels]
+
+    body_rows = agg_df.values.tolist()
+    subtotals = [(int(q), float(a)) for q, a in zip(agg_df["QTY"], agg_df["AMOUNT"])]
+    total_amount = agg_df["AMOUNT"].astype(float).sum()
+
+    # keep extra blank rows
+    for _ in range(L["extra_blank_rows"]):
+        body_rows.append([""]*len(header_row))
+        subtotals.append((0, 0.0))
+
+    # Row heights: first body row gets a little extra top breathing
+    body_heights = [L["body_row_h"] + L["first_body_extra"]] + [L["body_row_h"]]*(len(body_rows)-1)
+    ncols = len(col_widths)
+
+    def summary_row(label, totals):
+        qty, amount = totals
+        return [label,"","","","",f"{qty:,}","",f"USD {amount:,.2f}",""]
+
+    def summary_style(style, r):
+        style.add("SPAN",(0,r),(4,r))
+        style.add("ALIGN",(0,r),(4,r),"CENTER")
+        style.add("FONTNAME",(0,r),(4,r),"Helvetica-Bold")
+        style.add("FONTSIZE",(0,r),(4,r),8)
+        style.add("VALIGN",(0,r),(4,r),"MIDDLE")
+
+        style.add("SPAN",(5,r),(6,r))
+        style.add("ALIGN",(5,r),(6,r),"CENTER")
+        style.add("FONTNAME",(5,r),(6,r),"Helvetica-Bold")
+        style.add("FONTSIZE",(5,r),(6,r),7)
+        style.add("VALIGN",(5,r),(6,r),"MIDDLE")
+
+        style.add("SPAN",(7,r),(8,r))
+        style.add("ALIGN",(7,r),(8,r),"CENTER")
+        style.add("FONTNAME",(7,r),(8,r),"Helvetica-Bold")
+        style.add("FONTSIZE",(7,r),(8,r),7)
+
+        style.add("LINEABOVE",(0,r),(-1,r),0.5,colors.black)
+        style.add("LINEBELOW",(0,r),(-1,r),0.5,colors.black)
+        style.add("LINEAFTER",(4,r),(4,r),0.6,colors.black)
+        style.add("LINEAFTER",(6,r),(6,r),0.6,colors.black)
+
+    # one page worth of the items table: header, [brought forward], rows, carried forward / TOTAL
+    def items_chunk(rows, heights, brought, carried, final):
+        data = [header_row]
+        row_heights = [L["header_row_h"]]
+        if brought:
+            data.append(summary_row("BROUGHT FORWARD", brought))
+            row_heights.append(L["total_row_h"])
+        first_body = len(data)
+        data += rows
+        row_heights += heights
+        data.append(summary_row("TOTAL" if final else "CARRIED FORWARD", carried))
+        row_heights.append(L["total_row_h"])
+
+        items_style = TableStyle(parent=T["items"])
+        for c in range(ncols-1):
+            items_style.add("LINEAFTER",(c,0),(c,0),0.5,colors.black)
+            items_style.add("LINEAFTER",(c,first_body),(c,len(data)-2),0.25,colors.black)
+
+        items_style.add("LINEBELOW",(0,first_body),(-1,first_body),0.25,colors.white)
+        if brought:
+            summary_style(items_style, 1)
+        summary_style(items_style, len(data)-1)
+        items_style.add("LINEABOVE",(0,0),(-1,0),0.25,colors.black)
+
+        items_table = Table(data, colWidths=col_widths, rowHeights=row_heights)
+        items_table.setStyle(items_style)
+        return items_table
+
+    def items_chrome(brought, final):
+        return L["header_row_h"] + L["total_row_h"] * (2 if brought else 1)
+
+    # master header repeats on every page, flush above that page's slice of the items
+    items = CarryForwardTable([master_table], body_rows, body_heights, subtotals, items_chunk, items_chrome)
+    elements.append(section("items table", items))
+
+    # Amount in words
+    words_para = Paragraph(f"<b>TOTAL&nbsp;&nbsp;&nbsp;US DOLLAR {amount_to_words(total_amount)}</b>", S["amount_words"])
+    words_table = Table([[words_para]], colWidths=[available_width])
+    words_table.setStyle(T["note_box"])
+    elements.append(section("amount in words", words_table))
+
+    elements += tail
+    return _spaced(elements, 6)
+
+
+# ---------- "dark" layout (neo.py) ----------
+def _dark_story(theme, order, fields):
+    S, T, L = theme.styles, theme.tables, theme.layout
+    normal, bold, small_bold = S["normal"], S["bold"], S["small_bold"]
+    agg_df = order["agg_df"]
+    inner_width = L["inner_width"]
+
+    head=[]
+
+    # --- Header with futuristic panel ---
+    logo = AssetImage(LOGO, width=100, height=55)
+    title_table = Table([
+        [Paragraph("<font size=22 color='#ecf0f1'><b>PROFORMA INVOICE</b></font>", bold), logo]
+    ], colWidths=[0.75*inner_width, 0.25*inner_width])
+    title_table.setStyle(T["title"])
+    head.append(section("header", title_table))
+    head.append(Spacer(1,12))
+
+    # --- Supplier & Consignee futuristic box ---
+    sup=[
+        [Paragraph("Supplier Name: SAR APPARELS INDIA PVT.LTD.", small_bold), Paragraph(fields["pi_no"], normal)],
+        [Paragraph("Address: 6, Picaso Bithi, Kolkata - 700017", normal), Paragraph("<b>Landmark order Reference:</b> "+str(order["order_no"]), normal)],
+        [Paragraph("Phone: 9817473373", normal), Paragraph("<b>Buyer Name:</b> "+fields["buyer_name"], normal)],
+        [Paragraph("Fax: N.A.", normal), Paragraph("<b>Brand Name:</b> "+fields["brand_name"], normal)],
+    ]
+    con=[
+        [Paragraph("<b>Consignee:</b>", normal), Paragraph(fields["payment_term"], normal)],
+        [Paragraph(fields["consignee_name"], normal), Paragraph("<b>Bank Details (Including Swift/IBAN):</b>", normal)],
+        [Paragraph(fields["consignee_addr"], normal), Paragraph("Beneficiary: SAR APPARELS INDIA PVT.LTD", normal)],
+        [Paragraph(fields["consignee_tel"], normal), Paragraph("Account No: 2112819952", normal)],
+        ["", Paragraph("Bank: Kotak Mahindra Bank Ltd", normal)],
+        ["", Paragraph("Address: 2 Brabourne Road, Govind Bhavan, Ground Floor, Kolkata - 700001", normal)],
+        ["", Paragraph("SWIFT: KKBKINBBCPC", normal)],
+        ["", Paragraph("Bank Code: 0323", normal)],
+    ]
+    info_table=Table(sup+con,colWidths=[0.5*inner_width,0.5*inner_width])
+    info_table.setStyle(T["info"])
+    head.append(section("parties and bank block", info_table))
+    head.append(Spacer(1,12))
+
+    # --- Shipment Info futuristic box ---
+    ship=[
+        [Paragraph("<b>Loading Country:</b> "+str(order["made_in"]), normal), Paragraph("<b>Port of Loading:</b> "+str(order["loading_port"]), normal)],
+        [Paragraph("<b>Agreed Shipment Date:</b> "+str(order["ship_date"]), normal), Paragraph("<b>Description of goods:</b> "+str(order["order_of"]), normal)]
+    ]
+    ship_table=Table(ship,colWidths=[0.5*inner_width,0.5*inner_width])
+    ship_table.setStyle(T["box"])
+    head.append(section("shipment", ship_table))
+    head.append(Spacer(1,12))
+
+    # --- Main Items Table futuristic style ---
+    header=list(agg_df.columns)
+    subtotals=[(int(q), float(a)) for q, a in zip(agg_df["QTY"], agg_df["AMOUNT"])]
+    total_amount=agg_df["AMOUNT"].astype(float).sum()
+
+    def summary_row(label, totals):
+        qty, amount = totals
+        return [label,"","","","","",f"{qty:,}","USD",f"{amount:,.2f}"]
+
+    def items_chunk(rows, heights, brought, carried, final):
+        data=[header] + ([summary_row("BROUGHT FORWARD", brought)] if brought else []) + rows
+        data.append(summary_row("TOTAL" if final else "CARRIED FORWARD", carried))
+        style=TableStyle(parent=T["items"])
+        for r in ((1, len(data)-1) if brought else (len(data)-1,)):
+            style.add("SPAN",(0,r),(5,r))
+            style.add("BACKGROUND",(0,r),(-1,r),colors.HexColor("#ecf0f1"))
+            style.add("FONTNAME",(0,r),(-1,r),"Helvetica-Bold")
+            style.add("TEXTCOLOR",(0,r),(-1,r),colors.HexColor("#2c3e50"))
+            style.add("FONTSIZE",(0,r),(-1,r),9)
+        table=Table(data,colWidths=list(L["col_widths"]),
+                    rowHeights=[L["header_row_h"]] + [L["total_row_h"]]*bool(brought) + heights + [L["total_row_h"]])
+        table.setStyle(style)
+        return table
+
+    def items_chrome(brought, final):
+        return L["header_row_h"] + L["total_row_h"] * (2 if brought else 1)
+
+    # panels above the items repeat on every page
+    elements=[section("items table", CarryForwardTable(_spaced(head, 6) + [Spacer(1,6)], agg_df.values.tolist(),
+                                                       [L["body_row_h"]]*len(agg_df), subtotals, items_chunk, items_chrome))]
+
+    # --- Amount in Words box ---
+    words_table=Table([[Paragraph(f"TOTAL  US DOLLAR {amount_to_words(total_amount)}", bold)]],colWidths=[inner_width])
+    words_table.setStyle(T["box"])
+    elements.append(section("amount in words", words_table))
+
+    # --- Terms & Conditions box ---
+    terms_table=Table([[Paragraph("Terms & Conditions (if any):", normal)]],colWidths=[inner_width])
+    terms_table.setStyle(T["box"])
+    elements.append(section("footer", terms_table))
+    elements.append(Spacer(1,24))
+
+    # --- Signature futuristic box ---
+    sign_table=Table([
+        [AssetImage(SIGNATURE,width=150,height=50),
+         Paragraph("Signed by ………………… for RNA Resources Group Ltd - Landmark (Babyshop)", normal)]
+    ],colWidths=[0.5*inner_width,0.5*inner_width])
+    sign_table.setStyle(T["sign"])
+    elements.append(section("footer", sign_table))
+    return _spaced(elements, 6)
+
+
+LAYOUTS = {"master": _master_story, "dark": _dark_story}
+
+
+# options are layout specific, e.g. static_chrome=False for the all-platypus master layout
+def build_proforma(order, fields, theme="master", **options):
+    theme = THEMES[theme] if isinstance(theme, str) else theme
+    return LAYOUTS[theme.name](theme, order, {**FIELD_DEFAULTS, **fields}, **options)
+
+
+def render_proforma(order, fields, theme="master", sink=None, progress=None, **options):
+    theme = THEMES[theme] if isinstance(theme, str) else theme
+    L = theme.layout
+    left, right, top, bottom = L["margins"]
+    return render_pdf(build_proforma(order, fields, theme, **options), sink=sink, template=InvoiceDocTemplate, progress=progress,
+                      pagesize=L["pagesize"], leftMargin=left, rightMargin=right, topMargin=top, bottomMargin=bottom,
+                      box=L["page_box"], inset=L["frame_inset"], border=L["border"], background=L["background"],
+                      invariant=True)
+
+
+# Same as render_proforma, but a PDF already rendered from the same invoice
+# model (items, header fields, theme) is served from RENDER_CACHE.
+def render_proforma_cached(order, fields, theme="master", progress=None, key=None):
+    key = key or proforma_key(order, fields, theme)
+    return RENDER_CACHE.get_or_compute(key, lambda: render_proforma(order, fields, theme, progress=progress))
@@ -0,0 +1,29 @@
+from io import BytesIO
+
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import SimpleDocTemplate
+
+from xcel.timing import stage
+
+
+# canvas whose save() (serialising every page to PDF) is timed as "pdf_write"
+class TimedCanvas(Canvas):
+    def save(self):
+        with stage("pdf_write"):
+            super().save()
+
+
+# --- Build a story straight into memory (or into a caller's file-like sink) ---
+# Returns the PDF bytes; with a sink the PDF is written there and the sink is returned.
+# `progress` is a ReportLab progress callback, progress(kind, value), called
+# with "PAGE" (page number), "FINISHED" etc.; raising from it aborts the build.
+def render_pdf(story, sink=None, template=SimpleDocTemplate, progress=None, **doc_kwargs):
+    out = BytesIO() if sink is None else sink
+    doc = template(out, **doc_kwargs)
+    if progress is not None:
+        doc.setProgressCallBack(progress)
+    with stage("layout") as s:
+        doc.build(story, canvasmaker=TimedCanvas)
+        s["pages"] = doc.page
+        s["bytes"] = out.tell()
+    return out.getvalue() if sink is None else sink
@@ -0,0 +1,270 @@
+from types import MappingProxyType
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import TableStyle
+
+
+# --- Read-only style objects, built once at import and shared by every render ---
+class FrozenParagraphStyle(ParagraphStyle):
+    def __init__(self, name, parent=None, **kw):
+        super().__init__(name, parent, **kw)
+        self.__dict__["_frozen"] = True
+
+    def __setattr__(self, key, value):
+        if self.__dict__.get("_frozen"):
+            raise AttributeError(f"style {self.name!r} is shared; derive a new one instead")
+        super().__setattr__(key, value)
+
+
+class FrozenTableStyle(TableStyle):
+    def add(self, *cmd):
+        raise TypeError("shared TableStyle; use TableStyle(parent=...) to extend it")
+
+
+class Theme:
+    def __init__(self, name, styles, tables, **layout):
+        self.name = name
+        self.styles = MappingProxyType(styles)
+        self.tables = MappingProxyType(tables)
+        self.layout = MappingProxyType(layout)
+
+    def __repr__(self):
+        return f"<Theme {self.name!r}>"
+
+
+# same as getSampleStyleSheet()["Normal"]
+NORMAL = FrozenParagraphStyle("Normal", fontName="Helvetica", fontSize=10, leading=12)
+
+
+def _ps(name, **kw):
+    return FrozenParagraphStyle(name, parent=NORMAL, **kw)
+
+
+def _ts(*cmds):
+    return FrozenTableStyle(cmds)
+
+
+def _pad(left, right=None, top=None, bottom=None):
+    cmds = [("LEFTPADDING", (0, 0), (-1, -1), left), ("RIGHTPADDING", (0, 0), (-1, -1), left if right is None else right)]
+    if top is not None:
+        cmds.append(("TOPPADDING", (0, 0), (-1, -1), top))
+    if bottom is not None:
+        cmds.append(("BOTTOMPADDING", (0, 0), (-1, -1), bottom))
+    return cmds
+
+
+def _page_box(content_width, pagesize=A4, inset=36):
+    # where the old centred outer Table sat: 30pt margins + 6pt frame padding
+    return ((pagesize[0] - content_width) / 2, inset, content_width, pagesize[1] - 2 * inset)
+
+
+# ---------- "master": plain, master-aligned layout (saram.py) ----------
+def _master_theme():
+    content_width = A4[0] - 110
+    available_width = content_width - 0.5
+
+    # Columns
+    props = [0.125, 0.185, 0.12, 0.10, 0.15, 0.08, 0.07, 0.08, 0.09]
+    total_prop = sum(props); props = [p/total_prop for p in props]
+    col_widths = [available_width * p for p in props]
+    diff = available_width - sum(col_widths)
+    if abs(diff) > 0: col_widths[-1] += diff
+    left_width = sum(col_widths[:3]); right_width = available_width - left_width
+
+    # Align "origin" for bank answers
+    origin_left_absolute = sum(col_widths[:5])
+    indent_inside_right = origin_left_absolute - left_width
+    items_cell_left_padding = 4
+    indent_inside_right_corrected = max(0, indent_inside_right - items_cell_left_padding)
+    extra_left_shift = col_widths[6] * 3
+    spacer_to_origin = max(0, indent_inside_right_corrected - extra_left_shift)
+
+    colon_w = 9
+    label_col_w = max(80, available_width * 0.08)
+    remaining = right_width - spacer_to_origin - label_col_w - colon_w - 6
+    value_col_w = max(90, remaining)
+
+    # move CURRENCY to start of UNIT PRICE FOB column (index 7)
+    unit_price_col_index = 7
+    unit_left_rel_to_rightblock = max(0, sum(col_widths[:unit_price_col_index]) - left_width)
+    padding_needed = unit_left_rel_to_rightblock + 2
+
+    styles = {
+        "normal": NORMAL,
+        "title": _ps("title", alignment=1, fontSize=7),
+        "supplier_label": _ps("supplier_label", fontName="Helvetica-Bold", fontSize=8),
+        "supplier_company": _ps("supplier_company", fontName="Helvetica-Bold", fontSize=7),
+        "supplier_small_label": _ps("supplier_small_label", fontName="Helvetica", fontSize=6),
+        "supplier_small_value": _ps("supplier_small_value", fontName="Helvetica", fontSize=6),
+        "right_block": _ps("right_block", fontName="Helvetica", fontSize=8, leading=10),
+        "right_top": _ps("right_top", fontName="Helvetica-Bold", fontSize=8, leading=9),
+        "row1_normal": _ps("row1_normal", fontName="Helvetica", fontSize=8),
+        "payment_header": _ps("payment_header", fontName="Helvetica-Bold", fontSize=7),
+        "label_small": _ps("label_small", fontName="Helvetica-Bold", fontSize=7),
+        "value_small": _ps("value_small", fontName="Helvetica", fontSize=7, leading=8),
+        "amount_words": _ps("amount_words_style", fontName="Helvetica-Bold", fontSize=9, leading=10),
+        "terms_small": _ps("terms_small", fontName="Helvetica", fontSize=6, leading=7),
+        "tbl_header": _ps("tbl_header", alignment=1, fontName="Helvetica-Bold", fontSize=6.5, leading=8, textColor=colors.black),
+        "footer_left": _ps("fl", fontSize=6),
+        "footer_right": _ps("fr", fontSize=6, alignment=2, fontName="Helvetica-Bold"),
+    }
+
+    text_box = _ts(*_pad(4), ("VALIGN", (0, 0), (-1, -1), "TOP"))
+    note_box = _ts(("GRID", (0, 0), (-1, -1), 0.25, colors.white), *_pad(4))
+
+    items = [
+        ("GRID", (0, 1), (-1, -2), 0.25, colors.white),
+        ("LINEBELOW", (0, 0), (-1, 0), 0.5, colors.black),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.white),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 6.5),
+        ("FONTSIZE", (0, 1), (-1, -1), 7),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("LEFTPADDING", (0, 0), (-1, -1), 3), ("RIGHTPADDING", (0, 0), (-1, -1), 3),
+        ("TOPPADDING", (0, 0), (-1, -1), 0),
+    ]
+
+    tables = {
+        "supplier_title": _ts(*_pad(6, 6, 0, 2), ("VALIGN", (0, 0), (-1, -1), "TOP")),
+        "supplier_contact": _ts(*_pad(6, 6, 1, 1), ("VALIGN", (0, 0), (-1, -1), "TOP")),
+        "supplier_stack": _ts(("VALIGN", (0, 0), (-1, -1), "TOP"), *_pad(0, 6)),
+        "right_top": _ts(*_pad(2, 0, 2, 2), ("VALIGN", (0, 0), (-1, -1), "TOP"), ("LINEBELOW", (0, 0), (0, 0), 0.6, colors.black)),
+        "right_bottom": _ts(*_pad(2, 0, 4, 2), ("VALIGN", (0, 0), (-1, -1), "TOP")),
+        "right_stack": _ts(("VALIGN", (0, 0), (0, 1), "TOP"), ("LEFTPADDING", (0, 0), (0, 1), 2), ("RIGHTPADDING", (0, 0), (0, 1), 0)),
+        "consignee_box": _ts(*_pad(6, 6, 3, 3), ("VALIGN", (0, 0), (-1, -1), "TOP")),
+        "pay_term": _ts(("VALIGN", (0, 0), (-1, -1), "TOP"), *_pad(0)),
+        "bank_heading": _ts(("LEFTPADDING", (0, 0), (-1, -1), 0), ("TOPPADDING", (0, 0), (-1, -1), 0), ("BOTTOMPADDING", (0, 0), (-1, -1), 2)),
+        "bank_inner": _ts(("VALIGN", (0, 0), (-1, -1), "TOP"), *_pad(0, 0, 0, 0)),
+        "payment_block": _ts(("VALIGN", (0, 0), (-1, -1), "TOP"), *_pad(4, 0, 0, 0)),
+        "text_box": text_box,
+        "currency_box": _ts(
+            ("ALIGN", (0, 0), (0, 0), "RIGHT"),
+            ("VALIGN", (0, 0), (0, 0), "BOTTOM"),
+            ("LEFTPADDING", (0, 0), (0, 0), padding_needed),
+            ("RIGHTPADDING", (0, 0), (0, 0), 2),
+            ("TOPPADDING", (0, 0), (0, 0), 0), ("BOTTOMPADDING", (0, 0), (0, 0), 2),
+        ),
+        "master": _ts(
+            ("VALIGN", (0, 0), (1, 4), "TOP"),
+            # center divider starts from row 1 (so it stops at the line right below title)
+            ("LINEAFTER", (0, 1), (0, 4), 0.75, colors.black),
+            ("SPAN", (0, 0), (1, 0)),  # span title across both cols so it's centered
+            ("ALIGN", (0, 0), (1, 0), "CENTER"), ("VALIGN", (0, 0), (1, 0), "MIDDLE"),
+            ("LINEBELOW", (0, 0), (1, 0), 0.9, colors.black),  # title underline (thicker)
+            ("LINEBELOW", (0, 1), (1, 1), 0.35, colors.black),
+            ("LINEBELOW", (0, 2), (1, 2), 0.35, colors.black),
+            ("LINEBELOW", (0, 3), (1, 3), 0.35, colors.black),
+            ("LINEBELOW", (0, 4), (1, 4), 0.9, colors.black),
+            *_pad(0, 0, 0, 0),
+            ("BOTTOMPADDING", (0, 4), (1, 4), 0),
+            ("TOPPADDING", (0, 4), (1, 4), 0),
+        ),
+        "items": _ts(*items),
+        "note_box": note_box,
+        "sign_row": _ts(("VALIGN", (0, 0), (-1, -1), "MIDDLE"), ("ALIGN", (0, 0), (0, 0), "LEFT"), *_pad(4, 4, 2, 2)),
+        "footer_row": _ts(("VALIGN", (0, 0), (-1, -1), "TOP"), ("ALIGN", (0, 0), (0, 0), "LEFT"), ("ALIGN", (1, 0), (1, 0), "RIGHT"), *_pad(4, 4, 2, 2)),
+    }
+
+    return Theme(
+        "master", styles, tables,
+        pagesize=A4, margins=(30, 30, 30, 30),
+        content_width=content_width, available_width=available_width,
+        col_widths=tuple(col_widths), left_width=left_width, right_width=right_width,
+        bank_col_widths=(label_col_w, spacer_to_origin, colon_w, value_col_w),
+        title_row_h=18, row3_h=56, row4_h=56,
+        header_row_h=40, body_row_h=12, first_body_extra=4, total_row_h=16,
+        extra_blank_rows=10,
+        # page chrome: outer border drawn on every page around a padding-free frame
+        page_box=_page_box(content_width), frame_inset=(0, 0, 3, 3),
+        border=(0.75, colors.black), background=None,
+    )
+
+
+# ---------- "dark": futuristic dark header panel (neo.py) ----------
+def _dark_theme():
+    content_width = A4[0] - 110
+    inner_width = content_width - 6
+    table_width = inner_width - 6
+
+    styles = {
+        "normal": NORMAL,
+        "bold": _ps("bold", fontName="Helvetica-Bold", fontSize=10),
+        "small_bold": _ps("small_bold", fontName="Helvetica-Bold", fontSize=8),
+    }
+
+    box = [
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.HexColor("#bdc3c7")),
+        ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#ffffff")),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("LEFTPADDING", (0, 0), (-1, -1), 6),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 6),
+        ("TOPPADDING", (0, 0), (-1, -1), 4),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+    ]
+
+    tables = {
+        "title": _ts(
+            ("GRID", (0, 0), (-1, -1), 0.25, colors.HexColor("#95a5a6")),
+            ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#2c3e50")),
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+            ("ALIGN", (0, 0), (0, 0), "CENTER"),
+            ("ALIGN", (1, 0), (1, 0), "RIGHT"),
+            ("TOPPADDING", (0, 0), (-1, -1), 10),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
+        ),
+        "info": _ts(*box[:2], ("VALIGN", (0, 0), (-1, -1), "TOP"), *box[2:]),
+        "box": _ts(*box),
+        "items": _ts(
+            ("GRID", (0, 0), (-1, -1), 0.25, colors.HexColor("#bdc3c7")),
+            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#2c3e50")),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+            ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("FONTSIZE", (0, 0), (-1, 0), 7.5),
+
+            ("BACKGROUND", (0, 1), (-1, -2), colors.HexColor("#ffffff")),
+            ("ROWBACKGROUNDS", (0, 1), (-1, -2), [colors.HexColor("#ffffff"), colors.HexColor("#f9f9f9")]),
+
+            ("ALIGN", (0, 1), (5, -1), "CENTER"),
+            ("ALIGN", (6, 1), (-1, -1), "RIGHT"),
+            ("FONTSIZE", (0, 1), (-1, -1), 8),
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+
+            ("LEFTPADDING", (0, 0), (-1, -1), 6),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 6),
+            ("TOPPADDING", (0, 0), (-1, -1), 4),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+
+            ("BACKGROUND", (0, -1), (-1, -1), colors.HexColor("#ecf0f1")),
+            ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
+            ("TEXTCOLOR", (0, -1), (-1, -1), colors.HexColor("#2c3e50")),
+            ("FONTSIZE", (0, -1), (-1, -1), 9),
+        ),
+        "sign": _ts(
+            box[0], box[1],
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+            ("ALIGN", (0, 0), (0, 0), "LEFT"),
+            ("ALIGN", (1, 0), (1, 0), "RIGHT"),
+            *box[2:],
+        ),
+    }
+
+    props = [0.10, 0.21, 0.12, 0.10, 0.15, 0.08, 0.07, 0.08, 0.09]
+    return Theme(
+        "dark", styles, tables,
+        pagesize=A4, margins=(30, 30, 30, 30),
+        content_width=content_width, inner_width=inner_width, table_width=table_width,
+        col_widths=tuple(table_width * p for p in props),
+        header_row_h=20, body_row_h=20, total_row_h=20,
+        page_box=_page_box(content_width), frame_inset=(6, 6, 3, 3),
+        border=(1.5, colors.HexColor("#7f8c8d")), background=colors.HexColor("#ecf0f1"),
+    )
+
+
+MASTER = _master_theme()
+DARK = _dark_theme()
+THEMES = MappingProxyType({"master": MASTER, "dark": DARK})
@@ -0,0 +1,255 @@
+import contextvars
+import json
+import logging
+import os
+import sys
+import sysconfig
+import threading
+import time
+import tracemalloc
+import warnings
+from contextlib import contextmanager
+
+# --- Per-request stage timings ---
+# A request (one Streamlit script run, one CLI / batch workbook) is started
+# with start(); library code marks its stages with `with stage("read") as s:`
+# and may add counts (s["rows"], s["cells"], s["bytes"]). Outside a request
+# stage() does nothing, so the hooks cost a context-variable lookup.
+#
+# Stage times are exclusive: a stage nested inside another (pdf_write inside
+# layout) is subtracted from its parent, so the stages add up to the total.
+# Repeated stages (one pdf_write per streamed page) are merged, with `calls`.
+#
+# finish() writes the request as one JSON line to the "xcel.timing" logger.
+# XCEL_TIMING_LOG: unset -> stderr, a path -> appended to that file, "off" -> no log.
+#
+# Memory (opt-in: XCEL_TRACE_MEMORY=1, or start(..., memory=True)) runs
+# tracemalloc and adds to every stage its peak_kb (highest traced memory above
+# the stage's starting point) and net_kb (what the stage left allocated), plus
+# the top allocation sites of that net growth. Unlike times these are inclusive
+# of nested stages. XCEL_TRACE_MEMORY=N keeps N frames per allocation, so a
+# site inside pandas / ReportLab also names the repo line that led there
+# ("caller"); deep tracebacks are much slower. The peak counter is
+# process-wide, so profile one request at a time, not a busy server; tracing
+# makes everything several times slower, times included.
+
+log = logging.getLogger("xcel.timing")
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_STDLIB = sysconfig.get_paths()["stdlib"]
+TOP_SITES = 5
+_current = contextvars.ContextVar("xcel_timing", default=None)
+
+
+def _configure():
+    target = os.environ.get("XCEL_TIMING_LOG", "")
+    if log.handlers or target.lower() in ("off", "0", "false"):
+        log.disabled = target.lower() in ("off", "0", "false")
+        return
+    log.addHandler(logging.FileHandler(target) if target else logging.StreamHandler(sys.stderr))
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+
+_configure()
+
+
+def _memory_frames():
+    value = os.environ.get("XCEL_TRACE_MEMORY", "").strip().lower()
+    if value in ("", "0", "off", "false", "no"):
+        return 0
+    if value in ("on", "true", "yes"):
+        return 1
+    if value.isdigit():
+        return int(value)
+    warnings.warn(f"XCEL_TRACE_MEMORY={value!r} is not on/off or a frame count; memory tracing stays off")
+    return 0
+
+
+# tracemalloc is process-wide: the first memory request starts it, the last
+# one to finish stops it (tracing started outside xcel is left alone)
+_trace_lock = threading.Lock()
+_trace = {"requests": 0, "ours": False}
+
+
+def _trace_begin(frames):
+    with _trace_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            _trace["ours"] = True
+        _trace["requests"] += 1
+
+
+def _trace_end():
+    with _trace_lock:
+        _trace["requests"] -= 1
+        if _trace["requests"] == 0 and _trace["ours"]:
+            _trace["ours"] = False
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+
+def _where(frame):
+    name = frame.filename
+    if "site-packages" in name:
+        name = name.split("site-packages" + os.sep, 1)[1]
+    elif name.startswith(_ROOT):
+        name = os.path.relpath(name, _ROOT)
+    elif name.startswith(_STDLIB):
+        name = os.path.relpath(name, _STDLIB)
+    return f"{name}:{frame.lineno}"
+
+
+# the innermost frame that belongs to this repo (not pandas / ReportLab / stdlib)
+def _caller(traceback):
+    for frame in reversed(traceback):  # tracebacks run oldest call first
+        name = frame.filename
+        if name.startswith(_ROOT) and "site-packages" not in name and name != __file__:
+            return _where(frame)
+    return None
+
+
+# net growth between two snapshots, by allocation site and the repo line that led there
+def _grown_sites(before, after):
+    sites = {}
+    for diff in after.compare_to(before, "traceback"):
+        if diff.size_diff <= 0:
+            continue
+        frame = diff.traceback[-1]
+        if frame.filename in (tracemalloc.__file__, __file__):  # our own snapshots
+            continue
+        site = (_where(frame), _caller(diff.traceback))
+        size, count = sites.get(site, (0, 0))
+        sites[site] = (size + diff.size_diff, count + diff.count_diff)
+    return sites
+
+
+class Request:
+    def __init__(self, name, memory=None, **context):
+        self.name, self.context = name, context
+        self.stages = {}
+        self._stack = []
+        frames = _memory_frames() if memory is None else int(memory)
+        self.memory = frames > 0
+        self._tracing = self.memory  # holds a reference on tracing until finish()
+        if self._tracing:
+            _trace_begin(frames)
+        self._wall, self._cpu = time.perf_counter(), time.thread_time()
+        self.total_ms = self.cpu_ms = None
+
+    @contextmanager
+    def stage(self, name):
+        counts = {}
+        frame = [0.0, 0.0, 0]  # wall / cpu of nested stages, highest traced bytes seen
+        memory = self.memory and tracemalloc.is_tracing()
+        if memory:
+            self._mark_peak()  # the peak so far belongs to the parent stage
+            held = tracemalloc.get_traced_memory()[0]
+            before = tracemalloc.take_snapshot()
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._stack.append(frame)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield counts
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            if memory:
+                try:
+                    if not tracemalloc.is_tracing():
+                        raise RuntimeError("tracing stopped")
+                    self._mark_peak()
+                    current = tracemalloc.get_traced_memory()[0]
+                    sites = _grown_sites(before, tracemalloc.take_snapshot())
+                    tracemalloc.reset_peak()  # the parent resumes without our snapshots
+                except RuntimeError:  # stopped outside xcel while the stage ran: no figures for it
+                    memory = False
+                del before
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][0] += wall
+                self._stack[-1][1] += cpu
+                if memory:  # our peak as the parent sees it: minus our snapshot
+                    self._stack[-1][2] = max(self._stack[-1][2], frame[2] - (base - held))
+            rec = self.stages.setdefault(name, {"stage": name, "wall_ms": 0.0, "cpu_ms": 0.0, "calls": 0})
+            rec["wall_ms"] += (wall - frame[0]) * 1000
+            rec["cpu_ms"] += (cpu - frame[1]) * 1000
+            rec["calls"] += 1
+            for key, value in counts.items():
+                rec[key] = rec.get(key, 0) + value
+            if memory:
+                rec["peak_kb"] = max(rec.get("peak_kb", 0.0), (frame[2] - base) / 1024)
+                rec["net_kb"] = rec.get("net_kb", 0.0) + (current - base) / 1024
+                merged = rec.setdefault("_sites", {})
+                for site, (size, count) in sites.items():
+                    old = merged.get(site, (0, 0))
+                    merged[site] = (old[0] + size, old[1] + count)
+
+    # tracemalloc's peak since the last reset belongs to the innermost open stage
+    def _mark_peak(self):
+        if self._stack:
+            self._stack[-1][2] = max(self._stack[-1][2], tracemalloc.get_traced_memory()[1])
+
+    def finish(self):
+        if self.total_ms is None:
+            self.total_ms = (time.perf_counter() - self._wall) * 1000
+            self.cpu_ms = (time.thread_time() - self._cpu) * 1000
+            if self._tracing:
+                self._tracing = False
+                _trace_end()
+        return self
+
+    def as_dict(self):
+        rnd = lambda v: round(v, 2) if isinstance(v, float) else v
+        return {"request": self.name, **self.context,
+                "total_ms": rnd(self.total_ms), "cpu_ms": rnd(self.cpu_ms),
+                "stages": [_stage_dict(rec, rnd) for rec in self.stages.values()]}
+
+
+def _stage_dict(rec, rnd):
+    out = {k: rnd(v) for k, v in rec.items() if k != "_sites"}
+    if "_sites" in rec:
+        top = sorted(rec["_sites"].items(), key=lambda kv: kv[1][0], reverse=True)[:TOP_SITES]
+        out["top"] = [{"site": site, "caller": caller, "kb": round(size / 1024, 1), "blocks": count}
+                      for (site, caller), (size, count) in top]
+    return out
+
+
+# begin a request in this context (replacing any unfinished one)
+def start(name, memory=None, **context):
+    request = Request(name, memory, **context)
+    _current.set(request)
+    return request
+
+
+def finish(request=None):
+    request = request or _current.get()
+    if request is None:
+        return None
+    if _current.get() is request:
+        _current.set(None)
+    request.finish()
+    log.info(json.dumps(request.as_dict(), default=str))
+    return request
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def request(name, memory=None, **context):
+    req = start(name, memory, **context)
+    try:
+        yield req
+    finally:
+        finish(req)
+
+
+@contextmanager
+def _noop():
+    yield {}
+
+
+def stage(name):
+    req = _current.get()
+    return _noop() if req is None else req.stage(name)
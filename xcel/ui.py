@@ -0,0 +1,66 @@
+import streamlit as st
+
+
+# --- Streamlit widgets shared by the apps ---
+
+# Progress / cancel / download for the RenderJob in st.session_state[key].
+# While the job runs, the status fragment reruns on its own every half second
+# (the rest of the page does not rerun); once it finishes, one full rerun
+# redraws it without the timer.
+def render_status(key, label, file_name):
+    job = st.session_state.get(key)
+    if job is None:
+        return
+    polling = not job.done()
+    st.session_state[key + "_polling"] = polling
+    st.fragment(_job_status, run_every=0.5 if polling else None)(key, label, file_name)
+
+
+def _job_status(key, label, file_name):
+    job = st.session_state.get(key)
+    if job is None:
+        return
+    if job.done() and st.session_state.get(key + "_polling"):
+        st.rerun()
+
+    if not job.done():
+        st.progress(job.fraction, text=f"Rendering… page {job.pages}" if job.pages else "Rendering…")
+        if st.button("Cancel", key=key + "_cancel"):
+            job.cancel()
+            del st.session_state[key]
+            st.rerun()
+    elif job.cancelled:
+        st.warning("Rendering cancelled.")
+    elif job.error() is not None:
+        st.error(f"❌ Rendering failed: {job.error()}")
+    else:
+        st.download_button(label, job.result(), file_name=file_name, mime="application/pdf")
+
+
+# start a render for this session, coalesced with identical in-flight renders;
+# a different earlier render of this session is cancelled
+def submit_render(key, order, fields, theme):
+    from xcel.jobs import submit_proforma
+
+    previous = st.session_state.get(key)
+    job = submit_proforma(order, fields, theme)
+    if previous is not None and previous is not job and not previous.done():
+        previous.cancel()
+    elif previous is job:
+        job.cancel()  # same session clicked twice: keep one claim on the job
+    st.session_state[key] = job
+    return job
+
+
+# stage table for a finished xcel.timing request (the "Show stage timings" panel)
+def stage_timings(request):
+    if request is None:
+        return
+    st.write(f"### Stage timings — {request.total_ms:.0f} ms wall, {request.cpu_ms:.0f} ms CPU")
+    stages = request.as_dict()["stages"]
+    st.dataframe([{k: v for k, v in s.items() if k != "top"} for s in stages], hide_index=True)
+    if request.memory:
+        with st.expander("Top allocation sites per stage (net growth)"):
+            for s in stages:
+                st.write(f"**{s['stage']}**")
+                st.dataframe(s.get("top", []), hide_index=True)
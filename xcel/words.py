@@ -0,0 +1,22 @@
+def number_to_words(n):
+    ones = ["","ONE","TWO","THREE","FOUR","FIVE","SIX","SEVEN","EIGHT","NINE",
+            "TEN","ELEVEN","TWELVE","THIRTEEN","FOURTEEN","FIFTEEN","SIXTEEN",
+            "SEVENTEEN","EIGHTEEN","NINETEEN"]
+    tens = ["","","TWENTY","THIRTY","FORTY","FIFTY","SIXTY","SEVENTY","EIGHTY","NINETY"]
+    def words(num):
+        if num < 20: return ones[num]
+        elif num < 100: return tens[num//10] + ("" if num%10==0 else " " + ones[num%10])
+        elif num < 1000: return ones[num//100] + " HUNDRED" + ("" if num%100==0 else " " + words(num%100))
+        elif num < 1_000_000: return words(num//1000) + " THOUSAND" + ("" if num%1000==0 else " " + words(num%1000))
+        elif num < 1_000_000_000: return words(num//1_000_000) + " MILLION" + ("" if num%1_000_000==0 else " " + words(num%1_000_000))
+        else: return str(num)
+    return words(n)
+
+
+def amount_to_words(amount):
+    whole = int(amount)
+    fraction = int(round((amount - whole) * 100))
+    s = number_to_words(whole) + " DOLLARS"
+    if fraction > 0:
+        s += f" AND {number_to_words(fraction)} CENTS"
+    return s + " ONLY"
@@ -1,10 +1,4 @@
 import streamlit as st
-import pandas as pd
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-import tempfile
-import os
 
 st.set_page_config(page_title="Excel → PDF Aggregator", layout="centered")
 
@@ -13,6 +7,9 @@ st.title("📊 Excel to PDF Aggregator")
 uploaded_file = st.file_uploader("Upload your Excel file", type=["xlsx"])
 
 if uploaded_file:
+    # pandas and the parsers load once a workbook is uploaded
+    import pandas as pd
+
     # Read Excel into DataFrame
     df = pd.read_excel(uploaded_file)
     st.write("### Preview of uploaded data")
@@ -26,29 +23,34 @@ if uploaded_file:
     st.write("### Aggregated Data")
     st.dataframe(agg)
 
+    # Fast grid draws rows straight onto the page; same look, linear in row count.
+    # Streaming writes each page out as it is laid out, so memory stays flat.
+    renderer = st.radio("PDF renderer", ["Streaming (large reports)", "Fast table", "Table"], horizontal=True)
+
     # Generate PDF
     if st.button("Generate PDF"):
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmpfile:
-            pdf_file = tmpfile.name
-
-        doc = SimpleDocTemplate(pdf_file, pagesize=A4)
-
-        # Prepare table data
-        data = [agg.columns.tolist()] + agg.values.tolist()
-
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-            ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-            ("GRID", (0, 0), (-1, -1), 1, colors.black),
-            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ]))
-
-        doc.build([table])
-
-        with open(pdf_file, "rb") as f:
-            st.download_button("⬇️ Download PDF", f, file_name="aggregated_report.pdf")
-
-        # Cleanup temp file
-        os.remove(pdf_file)
+        # ReportLab loads only when a PDF is requested
+        from reportlab.platypus import Table, TableStyle
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import A4
+        from xcel.render import render_pdf
+        from xcel.fastgrid import render_grid
+
+        if renderer != "Table":
+            pdf_bytes = render_grid(agg, pagesize=A4, stream=renderer.startswith("Streaming"))
+        else:
+            # Prepare table data
+            data = [agg.columns.tolist()] + agg.values.tolist()
+
+            table = Table(data)
+            table.setStyle(TableStyle([
+                ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("GRID", (0, 0), (-1, -1), 1, colors.black),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ]))
+
+            pdf_bytes = render_pdf([table], pagesize=A4)
+
+        st.download_button("⬇️ Download PDF", pdf_bytes, file_name="aggregated_report.pdf")